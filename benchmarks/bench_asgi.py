@@ -0,0 +1,157 @@
+"""Mixed-workload comparison of the WSGI and ASGI serving modes.
+
+Usage (from the repository root; needs gunicorn and uvicorn):
+    python -m benchmarks.bench_asgi [--solvers 2] [--browsers 8] [--duration 15]
+                                    [--search-depth 50]
+
+Each server is started as a subprocess against one temporary SQLite database:
+  wsgi-sync     gunicorn, 1 sync worker (the render.yaml default)
+  wsgi-gthread  gunicorn, 1 worker x 8 threads, solves in the request threads
+  asgi          uvicorn + cauldron_optimizer.asgi, solves on the solver pool
+
+For `duration` seconds, `solvers` users loop GET / -> POST /optimize -> GET /results
+while `browsers` users loop over cheap requests (/results, /lang/<lang>, a static
+file). Reports throughput and p50/p95 latency per route for each server.
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks.loadtest import Recorder, VirtualUser
+
+SERVERS = {
+    "wsgi-sync": ["gunicorn", "-w", "1", "-b", "127.0.0.1:{port}", "api.index:app"],
+    "wsgi-gthread": [
+        "gunicorn",
+        "-w",
+        "1",
+        "--threads",
+        "8",
+        "-b",
+        "127.0.0.1:{port}",
+        "api.index:app",
+    ],
+    "asgi": [
+        "uvicorn",
+        "cauldron_optimizer.asgi:app",
+        "--port",
+        "{port}",
+        "--log-level",
+        "warning",
+    ],
+}
+
+
+class BrowsingUser(VirtualUser):
+    def browse(self) -> None:
+        self.request("GET /results", "/results")
+        self.request("GET /lang/<lang>", "/lang/en?next=/results")
+        self.request("GET /static", "/static/styles/main.css")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/login", timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+def run_mixed(base_url: str, args) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    run_id = f"{time.time_ns() % 10**6:06d}"
+    solvers = [VirtualUser(base_url, f"s{run_id}_{i}", recorder) for i in range(args.solvers)]
+    browsers = [BrowsingUser(base_url, f"b{run_id}_{i}", recorder) for i in range(args.browsers)]
+
+    # setup (not measured): accounts, sessions, and one result page per browser
+    for user in solvers + browsers:
+        user.register()
+    for user in browsers:
+        user.optimize(5, None)
+    recorder.latencies.clear()
+    recorder.errors.clear()
+
+    deadline = time.perf_counter() + args.duration
+
+    def loop(step) -> None:
+        while time.perf_counter() < deadline:
+            step()
+
+    threads = [
+        threading.Thread(target=loop, args=(lambda u=u: u.optimize(args.search_depth, None),))
+        for u in solvers
+    ] + [threading.Thread(target=loop, args=(u.browse,)) for u in browsers]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return recorder, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--solvers", type=int, default=2, help="users running searches")
+    parser.add_argument("--browsers", type=int, default=8, help="users on cheap pages")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per server")
+    parser.add_argument("--search-depth", type=int, default=50, help="n_starts per optimize")
+    parser.add_argument("--servers", default=",".join(SERVERS), help="comma-separated")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "bench")
+    env["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_asgi.db")
+    os.environ.update(env)
+
+    from cauldron_optimizer.database import engine
+    from cauldron_optimizer.db_model import Base
+
+    Base.metadata.create_all(engine)
+
+    print(
+        f"{'server':<14}{'route':<16}{'count':>7}{'errors':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}"
+    )
+    for name in args.servers.split(","):
+        port = free_port()
+        cmd = [part.format(port=port) for part in SERVERS[name]]
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=sys.stderr)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            wait_ready(base_url)
+            recorder, elapsed = run_mixed(base_url, args)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        total = sum(len(v) for v in recorder.latencies.values())
+        print(
+            f"{name:<14}{'(all)':<16}{total:>7}{sum(recorder.errors.values()):>8}{total / elapsed:>8.1f}"
+        )
+        for route, lat in recorder.latencies.items():
+            p50, p95 = 1000 * np.percentile(lat, [50, 95])
+            print(
+                f"{'':<14}{route:<16}{len(lat):>7}{recorder.errors[route]:>8}"
+                f"{len(lat) / elapsed:>8.1f}{p50:>9.1f}{p95:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""First-request latency after a cold start, with and without precompiled templates.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_coldstart [n_runs]
+
+Each run is a fresh interpreter that imports the app and serves /login, /contact
+and /register once (compile + render) and then once more (warm). The template
+cache is either empty or built with `flask build-templates`.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+from cauldron_optimizer import app
+t_import = time.perf_counter() - t0
+client = app.test_client()
+out = {"import": t_import}
+for label in ("first", "warm"):
+    t0 = time.perf_counter()
+    for path in ("/login", "/contact", "/register"):
+        client.get(path, headers={"Accept-Language": "en"})
+    out[label] = time.perf_counter() - t0
+print(json.dumps(out))
+"""
+
+
+def run_child(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(n_runs: int = 5) -> None:
+    base_env = {
+        **os.environ,
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "bench"),
+        "DATABASE_URL": os.environ.get("DATABASE_URL", "sqlite://"),
+    }
+    empty_dir, built_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    subprocess.run(
+        ["flask", "--app", "cauldron_optimizer", "build-templates"],
+        env={**base_env, "TEMPLATE_CACHE_DIR": built_dir},
+        check=True,
+        capture_output=True,
+    )
+
+    print(f"{'templates':<12}{'import ms':>11}{'first req ms':>14}{'warm req ms':>13}")
+    for label, cache_dir in (("compiled", empty_dir), ("precompiled", built_dir)):
+        runs = []
+        for _ in range(n_runs):
+            for name in os.listdir(empty_dir):  # keep the cold case cold
+                os.remove(os.path.join(empty_dir, name))
+            runs.append(run_child({**base_env, "TEMPLATE_CACHE_DIR": cache_dir}))
+        med = {
+            k: 1000 * np.median([r[k] for r in runs]) / (1 if k == "import" else 3) for k in runs[0]
+        }
+        print(f"{label:<12}{med['import']:>11.1f}{med['first']:>14.1f}{med['warm']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,103 @@
+"""Bytes per page view and server CPU per request, by Accept-Encoding.
+
+Usage (from the repository root; run `flask --app cauldron_optimizer build-static`
+first, or static files are served uncompressed):
+    python -m benchmarks.bench_compression [n_runs]
+
+A logged-in user (in-process test client, temporary SQLite database) views /,
+/results and /formula with an empty browser cache: the HTML plus every static
+file it references, following @import and url() in stylesheets. Reports the bytes
+sent per page view and the median process CPU per request, for HTML and static
+files separately.
+"""
+
+import os
+import posixpath
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+PAGES = ("/", "/results", "/formula")
+ENCODINGS = ("identity", "gzip", "br, gzip")
+STATIC_RE = re.compile(r"""/static/[^"'()?\s]+""")
+CSS_URL_RE = re.compile(r"""url\(\s*['"]?([^'")?]+)""")
+
+
+def assets(client, html: str) -> list[str]:
+    """Static paths a page view loads, stylesheet imports included."""
+    todo, seen = STATIC_RE.findall(html), []
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.append(path)
+        if path.endswith(".css"):
+            css = client.get(path, headers={"Accept-Encoding": "identity"}).get_data(as_text=True)
+            for ref in CSS_URL_RE.findall(css):
+                todo.append(
+                    ref if ref.startswith("/") else posixpath.join(posixpath.dirname(path), ref)
+                )
+    return seen
+
+
+def timed_get(client, path: str, encoding: str):
+    t0 = time.process_time()
+    response = client.get(path, headers={"Accept-Encoding": encoding})
+    data = response.data  # reads (and closes) file responses inside the timing
+    return len(data), time.process_time() - t0
+
+
+def main(n_runs: int = 20) -> None:
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+    from cauldron_optimizer import app
+    from cauldron_optimizer.database import engine
+    from cauldron_optimizer.db_model import Base
+
+    Base.metadata.create_all(engine)
+    app.config["WTF_CSRF_ENABLED"] = False
+    client = app.test_client()
+    client.post(
+        "/register", data={"username": "bench", "password": "bench", "confirmation": "bench"}
+    )
+    client.post(
+        "/optimize",
+        data={
+            "n_diploma": 10,
+            "alpha_UB": 8,
+            "prob_UB": 100,
+            "n_starts": 5,
+            "effect_weights_json": "[1, 0.5, 0, 0, 0, 0, 0, 0, 0, 0]",
+            "language": "en",
+        },
+    )
+    page_assets = {page: assets(client, client.get(page).get_data(as_text=True)) for page in PAGES}
+
+    print(
+        f"{'encoding':<10}{'page':<10}{'files':>6}{'html B':>9}{'static B':>10}"
+        f"{'html cpu us':>13}{'static cpu us':>15}"
+    )
+    for encoding in ENCODINGS:
+        for page in PAGES:
+            html_cpu, static_cpu = [], []
+            for _ in range(n_runs):
+                html_bytes, cpu = timed_get(client, page, encoding)
+                html_cpu.append(cpu)
+                static_bytes = 0
+                for path in page_assets[page]:
+                    size, cpu = timed_get(client, path, encoding)
+                    static_bytes += size
+                    static_cpu.append(cpu)
+            print(
+                f"{encoding.split(',')[0]:<10}{page:<10}{len(page_assets[page]) + 1:>6}"
+                f"{html_bytes:>9}{static_bytes:>10}"
+                f"{1e6 * np.median(html_cpu):>13.0f}{1e6 * np.median(static_cpu):>15.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,69 @@
+"""Compare search engines on time-to-target-quality over the benchmark catalogue.
+
+Usage (from the repository root, with .env configured):
+    python -m benchmarks.bench_engines [n_repeats] [time_limit_ms]
+
+The target of each case is the best score any engine reaches in a long
+reference run. Each engine then runs single starts (relaxation starts) on a
+fresh optimizer, its relaxed optimum computed beforehand, until it reaches the
+target or the time limit; the median time and the hit rate over n_repeats are
+reported. The elite set is emptied before every start, so no start begins at a
+recipe an earlier solve found. The last line is each engine's time per start
+relative to greedy (the per-case medians, averaged over the catalogue), the
+engine factor of admission.ENGINE_COST.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.catalogue import CASES
+from cauldron_optimizer.optimizer.optimizer import CauldronOptimizer
+
+
+def time_to_target(kwargs: dict, engine: str, target: float, limit: float, starts: list):
+    """Seconds until a start reaches target (None past limit); appends start times."""
+    opt = CauldronOptimizer(**kwargs)
+    opt._relaxed = opt.relaxed_optimum()  # shared by all starts: not an engine cost
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < limit:
+        opt._elite.clear()  # multistart would add the best earlier recipe as a start
+        t_start = time.perf_counter()
+        _, val = opt.multistart(1, starts="relaxation", engine=engine)
+        starts.append(time.perf_counter() - t_start)
+        if val >= target - 1e-9:
+            return time.perf_counter() - t0
+    return None
+
+
+def main(n_repeats: int = 10, time_limit_ms: int = 2000) -> None:
+    limit = time_limit_ms / 1000
+    print(f"{'case':<16}{'target':>10}" + "".join(f"{e:>20}" for e in CauldronOptimizer.engines))
+    start_times = {engine: [] for engine in CauldronOptimizer.engines}
+    for name, kwargs in CASES.items():
+        np.random.seed(0)
+        opt = CauldronOptimizer(**kwargs)
+        target = max(opt.multistart(50, engine=e)[1] for e in opt.engines)
+
+        cells = []
+        for engine in opt.engines:
+            starts = []
+            times = [
+                time_to_target(kwargs, engine, target, limit, starts) for _ in range(n_repeats)
+            ]
+            start_times[engine].append(float(np.median(starts)))
+            hits = [t for t in times if t is not None]
+            median = f"{1000 * float(np.median(hits)):.1f}ms" if hits else "-"
+            cells.append(f"{median} ({len(hits)}/{n_repeats})")
+        print(f"{name:<16}{target:>10.3f}" + "".join(f"{c:>20}" for c in cells))
+
+    per_start = {engine: float(np.mean(t)) for engine, t in start_times.items()}
+    print(
+        f"{'cost/start':<26}"
+        + "".join(f"{per_start[e] / per_start['greedy']:>20.2f}" for e in per_start)
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""Login latency and CPU per login: inline hashing vs the offloaded policy.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_login [concurrency] [logins] [method ...]
+
+For each hashing method, `logins` verifications are run by `concurrency` request
+threads, first inline on the request thread (the previous behaviour) and then
+through cauldron_optimizer.passwords (bounded pool, PASSWORD_HASH_WORKERS).
+Reports p50/p95 login latency and process CPU time per login.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from cauldron_optimizer import passwords
+
+
+def run(verify, pwhash: str, concurrency: int, logins: int) -> tuple[float, float, float]:
+    def login(_):
+        t0 = time.perf_counter()
+        verify(pwhash, "hunter2")
+        return time.perf_counter() - t0
+
+    cpu0 = time.process_time()
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies = list(pool.map(login, range(logins)))
+    cpu = (time.process_time() - cpu0) / logins
+    p50, p95 = 1000 * np.percentile(latencies, [50, 95])
+    return p50, p95, 1000 * cpu
+
+
+def main(concurrency: int = 8, logins: int = 64, *methods: str) -> None:
+    methods = methods or ("scrypt:32768:8:1", "pbkdf2:sha256:600000", "pbkdf2:sha256:100000")
+    print(f"{'method':<24}{'mode':<10}{'p50 ms':>9}{'p95 ms':>9}{'cpu ms/login':>14}")
+    for method in methods:
+        pwhash = generate_password_hash("hunter2", method)
+        for mode, verify in (
+            ("inline", check_password_hash),
+            ("offload", passwords.verify_password),
+        ):
+            p50, p95, cpu = run(verify, pwhash, concurrency, logins)
+            print(f"{method:<24}{mode:<10}{p50:>9.1f}{p95:>9.1f}{cpu:>14.1f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(*(int(a) for a in args[:2]), *args[2:])
@@ -0,0 +1,166 @@
+"""Requests and time to a fully loaded page on a throttled mobile connection.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pageload [--rtt 0.15] [--mbps 1.6] [--connections 6]
+
+A logged-in user (in-process test client, temporary SQLite database, a 10-effect
+search done) views /, /results and /formula with an empty browser cache. The
+files a browser would load are collected: static references in the HTML, then
+@import and url() in stylesheets (background images only when a class of their
+rule occurs in the page or its scripts), and icon URLs built by optimizer.js
+(`${i + 1}` loops over the page's effects or the ingredients). Response sizes
+are those sent for "Accept-Encoding: br, gzip".
+
+Loading is then simulated: each request costs one round trip, at most
+`connections` run at once, they share the bandwidth equally, and a file's
+references are requested once it has arrived. The default network is
+Lighthouse's mobile throttling (150 ms RTT, 1.6 Mbps).
+"""
+
+import argparse
+import os
+import posixpath
+import re
+import tempfile
+
+PAGES = ("/", "/results", "/formula")
+N_DIPLOMA = 10
+STATIC_RE = re.compile(r"""/static/[^"'()?\s$`]+(?:\$\{\w \+ 1\}[^"'()?\s`]*)?""")
+CSS_RULE_RE = re.compile(r"([^{}]*)\{([^{}]*)\}")
+CSS_URL_RE = re.compile(r"""url\(\s*['"]?([^'")?]+)""")
+CLASS_RE = re.compile(r"\.([\w-]+)")
+
+
+def expand(path: str, ranges: dict[str, int]) -> list[str]:
+    """Static paths of a script template such as /static/effects/effect${i + 1}.png."""
+    if "${" not in path:
+        return [path]
+    folder = path.split("/")[2]
+    head, tail = re.split(r"\$\{\w \+ 1\}", path)
+    return [f"{head}{k}{tail}" for k in range(1, ranges[folder] + 1)]
+
+
+def used_class(name: str, page_text: str) -> bool:
+    """Whether the page or its scripts use a class, also as `prefix-${i + 1}`."""
+    if re.search(rf"(?<![\w-]){name}(?![\w-])", page_text):
+        return True
+    prefix = re.sub(r"\d+$", "", name)
+    return prefix != name and prefix + "${" in page_text
+
+
+def references(path: str, text: str, page_text: str, ranges: dict[str, int]) -> list[str]:
+    """Static files requested once `path` (with content `text`) has loaded."""
+    if path.endswith(".css"):
+        text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+        urls = CSS_URL_RE.findall(";".join(re.findall(r"@import[^;]*;", text)))
+        for selector, body in CSS_RULE_RE.findall(text):
+            classes = CLASS_RE.findall(selector.rsplit(";", 1)[-1])
+            if not classes or any(used_class(c, page_text) for c in classes):
+                urls += CSS_URL_RE.findall(body)
+        return [
+            u if u.startswith("/") else posixpath.join(posixpath.dirname(path), u)
+            for u in urls
+            if not u.startswith("data:")
+        ]
+    if path.endswith(".js") or not path.startswith("/static/"):
+        return [p for ref in STATIC_RE.findall(text) for p in expand(ref, ranges)]
+    return []
+
+
+def crawl(client, page: str, ranges: dict[str, int]) -> dict[str, tuple[int, list[str]]]:
+    """{path: (bytes sent, paths it references)} for one page view.
+
+    `ranges` bounds the script loops by icon folder, e.g. {"effects": 10}.
+    """
+    headers = {"Accept-Encoding": "br, gzip"}
+    html = client.get(page).get_data(as_text=True)
+    scripts = "".join(
+        client.get(p).get_data(as_text=True) for p in STATIC_RE.findall(html) if p.endswith(".js")
+    )
+    page_text = html + scripts
+    files, todo = {}, [page]
+    while todo:
+        path = todo.pop()
+        if path in files:
+            continue
+        response = client.get(path, headers=headers)
+        size = len(response.data)
+        text = "" if path.endswith((".png", ".ico")) else client.get(path).get_data(as_text=True)
+        refs = references(path, text, page_text, ranges)
+        files[path] = (size, refs)
+        todo.extend(refs)
+    return files
+
+
+def simulate(files: dict, root: str, rtt: float, bandwidth: float, connections: int) -> float:
+    """Seconds until every file has arrived (see the module docstring)."""
+    now, queue, active = 0.0, [root], {}  # active: path -> [start, bytes left]
+    requested = {root}
+    while queue or active:
+        while queue and len(active) < connections:
+            path = queue.pop(0)
+            active[path] = [now + rtt, files[path][0]]
+        # the next event: a round trip ends or a transfer completes
+        moving = [p for p, (start, _) in active.items() if start <= now]
+        rate = bandwidth / max(1, len(moving))
+        events = [start for start, _ in active.values() if start > now]
+        events += [now + left / rate for p, (_, left) in active.items() if p in moving]
+        step = min(events) - now
+        for p in moving:
+            active[p][1] -= step * rate
+        now += step
+        for p, (start, left) in list(active.items()):
+            if start <= now and left <= 1e-6:
+                del active[p]
+                for ref in files[p][1]:
+                    if ref not in requested:
+                        requested.add(ref)
+                        queue.append(ref)
+    return now
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt", type=float, default=0.15, help="round trip, seconds")
+    parser.add_argument("--mbps", type=float, default=1.6, help="download bandwidth")
+    parser.add_argument("--connections", type=int, default=6, help="parallel requests")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+    from cauldron_optimizer import app
+    from cauldron_optimizer.constants import N_INGREDIENTS
+    from cauldron_optimizer.database import engine
+    from cauldron_optimizer.db_model import Base
+
+    Base.metadata.create_all(engine)
+    app.config["WTF_CSRF_ENABLED"] = False
+    client = app.test_client()
+    client.post(
+        "/register", data={"username": "bench", "password": "bench", "confirmation": "bench"}
+    )
+    client.post(
+        "/optimize",
+        data={
+            "n_diploma": N_DIPLOMA,
+            "alpha_UB": 8,
+            "prob_UB": 100,
+            "n_starts": 5,
+            "effect_weights_json": str([1.0] + [0.0] * (N_DIPLOMA - 1)),
+            "language": "en",
+        },
+    )
+
+    ranges = {"effects": N_DIPLOMA, "ingredients": N_INGREDIENTS}
+    print(f"{'page':<10}{'requests':>9}{'images':>8}{'bytes':>10}{'loaded s':>10}")
+    for page in PAGES:
+        files = crawl(client, page, ranges)
+        images = sum(p.endswith(".png") for p in files)
+        total = sum(size for size, _ in files.values())
+        seconds = simulate(files, page, args.rtt, args.mbps * 1e6 / 8, args.connections)
+        print(f"{page:<10}{len(files):>9}{images:>8}{total:>10}{seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Per-worker memory and warm-up of gunicorn, importing vs preloaded (gunicorn.conf.py).
+
+Usage (from the repository root; needs gunicorn, Linux /proc):
+    python -m benchmarks.bench_prefork [--workers 4] [--threads 4]
+
+Both modes serve one temporary SQLite database with `workers` workers of `threads`
+threads each:
+  import   gunicorn -w N api.index:app   each worker imports the app itself
+  preload  gunicorn -w N                 gunicorn.conf.py: the master imports and
+                                         warms the app, workers are forked
+
+For each: seconds from launch to the first response, then one login per worker and
+cold requests issued to all workers at once (the index page, and /frontier for
+new accounts' default structure), then memory from /proc/<pid>/smaps_rollup:
+RSS, PSS (shared pages split among their users) and USS (private pages) per worker,
+and the PSS of the whole server (master included).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.bench_asgi import free_port, wait_ready
+from benchmarks.loadtest import Recorder, VirtualUser
+
+MODES = {
+    "import": [
+        "gunicorn",
+        "-c",
+        "/dev/null",
+        "-w",
+        "{workers}",
+        "--threads",
+        "{threads}",
+        "-b",
+        "127.0.0.1:{port}",
+        "api.index:app",
+    ],
+    "preload": [
+        "gunicorn",
+        "-c",
+        "gunicorn.conf.py",
+        "-w",
+        "{workers}",
+        "--threads",
+        "{threads}",
+        "-b",
+        "127.0.0.1:{port}",
+    ],
+}
+FRONTIER = "/frontier?n_diploma=4&alpha_UB=25&prob_UB=100"
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                fields[name] = int(rest.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def children(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(c) for c in f.read().split()]
+
+
+def concurrently(users: list[VirtualUser], route: str, path: str) -> None:
+    threads = [threading.Thread(target=u.request, args=(route, path)) for u in users]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "bench")
+    env["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_prefork.db")
+    os.environ.update(env)
+
+    from cauldron_optimizer.database import db_session, engine
+    from cauldron_optimizer.db_model import Base, User, UserSettings
+
+    Base.metadata.create_all(engine)
+    names = [f"w{i}" for i in range(args.workers)]
+    with db_session() as db:
+        for name in names:
+            db.add(UserSettings(user=User(username=name, password="loadtest")))
+
+    print(
+        f"{'mode':<9}{'first resp s':>13}{'cold / ms':>11}{'cold frontier ms':>18}"
+        f"{'RSS MB':>8}{'PSS MB':>8}{'USS MB':>8}{'total PSS MB':>14}"
+    )
+    for mode, template in MODES.items():
+        port = free_port()
+        cmd = [
+            part.format(port=port, workers=args.workers, threads=args.threads) for part in template
+        ]
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            wait_ready(base_url)
+            first = time.perf_counter() - t0
+
+            recorder = Recorder()
+            users = [VirtualUser(base_url, name, recorder) for name in names]
+            for user in users:
+                user.login()
+            concurrently(users, "GET /", "/")
+            concurrently(users, "GET /frontier", FRONTIER)
+
+            workers = children(proc.pid)
+            per_worker = [memory_kb(pid) for pid in workers]
+            total_pss = memory_kb(proc.pid)["pss"] + sum(m["pss"] for m in per_worker)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        cold_index = 1000 * np.median(recorder.latencies["GET /"])
+        cold_frontier = 1000 * np.median(recorder.latencies["GET /frontier"])
+        avg = {k: np.mean([m[k] for m in per_worker]) / 1024 for k in ("rss", "pss", "uss")}
+        print(
+            f"{mode:<9}{first:>13.2f}{cold_index:>11.0f}{cold_frontier:>18.0f}"
+            f"{avg['rss']:>8.1f}{avg['pss']:>8.1f}{avg['uss']:>8.1f}{total_pss / 1024:>14.1f}"
+        )
+        if sum(recorder.errors.values()):
+            print(f"  errors: {dict(recorder.errors)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
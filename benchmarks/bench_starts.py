@@ -0,0 +1,41 @@
+"""Compare multistart start generators on the benchmark catalogue.
+
+Usage (from the repository root, with .env configured):
+    python -m benchmarks.bench_starts [n_starts] [n_repeats]
+
+Reports, per case and start method: greedy moves per start, mean best score,
+and best score per millisecond of solve time.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.catalogue import CASES
+from cauldron_optimizer.optimizer.optimizer import CauldronOptimizer
+
+
+def main(n_starts: int = 20, n_repeats: int = 5) -> None:
+    print(f"{'case':<16}{'starts':<12}{'moves/start':>12}{'score':>10}{'ms':>10}{'score/ms':>10}")
+    for name, kwargs in CASES.items():
+        for starts in ("random", "relaxation"):
+            np.random.seed(0)
+            moves, scores, elapsed = 0, [], 0.0
+            for _ in range(n_repeats):
+                opt = CauldronOptimizer(**kwargs)
+                t0 = time.perf_counter()
+                _, val = opt.multistart(n_starts, starts=starts)
+                elapsed += time.perf_counter() - t0
+                moves += opt.n_moves
+                scores.append(val)
+            ms = 1000 * elapsed / n_repeats
+            score = float(np.mean(scores))
+            print(
+                f"{name:<16}{starts:<12}{moves / (n_starts * n_repeats):>12.1f}"
+                f"{score:>10.3f}{ms:>10.1f}{score / ms:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,37 @@
+"""Benchmark catalogue: representative optimizer configurations.
+
+Each case holds the CauldronOptimizer keyword arguments of one problem.
+"""
+
+CASES = {
+    "notebook": dict(
+        effect_weights=[0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0],
+        premium_ingr=[3, 4, 9, 10],
+        alpha_UB=11,
+        prob_UB=20,
+    ),
+    "single_effect": dict(
+        effect_weights=[0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+        premium_ingr=[],
+        alpha_UB=25,
+        prob_UB=100,
+    ),
+    "mixed_weights": dict(
+        effect_weights=[0.2, 0.5, 1, 0, 0.3, 0, 0.8, 0, 0.1, 0, 0, 0.6, 0, 0, 0.4],
+        premium_ingr=[2, 7],
+        alpha_UB=8,
+        prob_UB=40,
+    ),
+    "all_effects": dict(
+        effect_weights=[1] * 25,
+        premium_ingr=[],
+        alpha_UB=25,
+        prob_UB=100,
+    ),
+    "capped_premium": dict(
+        effect_weights=[0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
+        premium_ingr=[0, 5, 6, 11],
+        alpha_UB=5,
+        prob_UB=25,
+    ),
+}
@@ -0,0 +1,199 @@
+"""End-to-end load test: register -> (login -> index -> optimize -> results) x N.
+
+Usage (from the repository root):
+    python -m benchmarks.loadtest [--users 8] [--iterations 5] [--search-depth 20]
+                                  [--engine tabu] [--url http://host:port]
+
+Without --url the app is booted in-process on a threaded werkzeug server against
+DATABASE_URL, which defaults to a temporary SQLite stand-in; the schema is created
+from db_model. Point DATABASE_URL at a local Postgres for a closer match to
+production, or use --url to load an already running server (e.g. gunicorn).
+
+Reports throughput and p50/p95/p99 latency per route.
+"""
+
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+CSRF_RE = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Recorder:
+    """Thread-safe latency store, keyed by route."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, route: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.latencies[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+
+class VirtualUser:
+    """One browser session: cookie jar, CSRF tokens and the scripted flow."""
+
+    def __init__(self, base_url: str, username: str, recorder: Recorder):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = "loadtest"
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect()
+        )
+
+    def request(self, route: str, path: str, data: dict | list | None = None) -> str:
+        body = urllib.parse.urlencode(data, doseq=True).encode() if data is not None else None
+        t0 = time.perf_counter()
+        try:
+            with self.opener.open(self.base_url + path, data=body) as resp:
+                text, status = resp.read().decode(), resp.status
+        except urllib.error.HTTPError as e:
+            text, status = e.read().decode(), e.code
+        # successful POSTs redirect; a 200 means the error page was rendered
+        ok = 300 <= status < 400 if data is not None else status < 400
+        self.recorder.add(route, time.perf_counter() - t0, ok)
+        return text
+
+    def csrf(self, html: str) -> str:
+        match = CSRF_RE.search(html)
+        return match.group(1) if match else ""
+
+    def register(self) -> None:
+        token = self.csrf(self.request("GET /register", "/register"))
+        self.request(
+            "POST /register",
+            "/register",
+            {
+                "csrf_token": token,
+                "username": self.username,
+                "password": self.password,
+                "confirmation": self.password,
+            },
+        )
+
+    def iteration(self, search_depth: int, engine: str | None) -> None:
+        self.request("GET /logout", "/logout")
+        self.login()
+        self.optimize(search_depth, engine)
+
+    def login(self) -> None:
+        token = self.csrf(self.request("GET /login", "/login"))
+        self.request(
+            "POST /login",
+            "/login",
+            {"csrf_token": token, "username": self.username, "password": self.password},
+        )
+
+    def optimize(self, search_depth: int, engine: str | None) -> None:
+        token = self.csrf(self.request("GET /", "/"))
+
+        # a realistic request: a handful of wanted effects among n diplomas
+        n_diploma = random.randint(5, 25)
+        weights = [0.0] * n_diploma
+        for i in random.sample(range(n_diploma), k=random.randint(1, 4)):
+            weights[i] = round(random.uniform(0.1, 1.0), 2)
+        form = {
+            "csrf_token": token,
+            "n_diploma": n_diploma,
+            "alpha_UB": random.choice([5, 8, 11, 25]),
+            "prob_UB": random.choice([20, 40, 100]),
+            "n_starts": search_depth,
+            "effect_weights_json": json.dumps(weights),
+            "language": "en",
+            "premium_ingredients[]": random.sample(range(12), k=random.randint(0, 4)),
+        }
+        if engine:
+            form["engine"] = engine
+        self.request("POST /optimize", "/optimize", form)
+        self.request("GET /results", "/results")
+
+
+def boot_local_server() -> str:
+    """Serve the app in-process against DATABASE_URL (default: temporary SQLite)."""
+    if "DATABASE_URL" not in os.environ:
+        db_path = os.path.join(tempfile.mkdtemp(), "loadtest.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SECRET_KEY", "loadtest")
+
+    from werkzeug.serving import make_server
+
+    from cauldron_optimizer import app
+    from cauldron_optimizer.database import engine
+    from cauldron_optimizer.db_model import Base
+
+    Base.metadata.create_all(engine)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def report(recorder: Recorder, elapsed: float) -> None:
+    total = sum(len(v) for v in recorder.latencies.values())
+    print(f"{total} requests in {elapsed:.2f}s: {total / elapsed:.1f} req/s")
+    print(
+        f"{'route':<18}{'count':>7}{'errors':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for route, lat in recorder.latencies.items():
+        p50, p95, p99 = 1000 * np.percentile(lat, [50, 95, 99])
+        print(
+            f"{route:<18}{len(lat):>7}{recorder.errors[route]:>8}{len(lat) / elapsed:>8.1f}"
+            f"{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=8, help="concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=5, help="flows per user")
+    parser.add_argument("--search-depth", type=int, default=20, help="n_starts per optimize")
+    parser.add_argument("--engine", default=None, help="search engine (default: server's)")
+    parser.add_argument("--url", default=None, help="target a running server instead")
+    args = parser.parse_args()
+
+    base_url = args.url or boot_local_server()
+    recorder = Recorder()
+    run_id = f"{time.time_ns() % 10**6:06d}"
+    users = [VirtualUser(base_url, f"lt{run_id}_{i}", recorder) for i in range(args.users)]
+
+    def run(user: VirtualUser) -> None:
+        for _ in range(args.iterations):
+            user.iteration(args.search_depth, args.engine)
+
+    with ThreadPoolExecutor(args.users) as pool:
+        list(pool.map(VirtualUser.register, users))
+        recorder.latencies.clear()  # setup is not part of the measured flow
+        recorder.errors.clear()
+        t0 = time.perf_counter()
+        list(pool.map(run, users))
+        elapsed = time.perf_counter() - t0
+
+    report(recorder, elapsed)
+
+
+if __name__ == "__main__":
+    main()
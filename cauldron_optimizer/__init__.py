@@ -6,8 +6,10 @@ from flask_babel import gettext as _
 from flask_wtf.csrf import CSRFError, CSRFProtect
 from sqlalchemy.exc import SQLAlchemyError
 
-from cauldron_optimizer.config import get_secret_key, select_locale
-from cauldron_optimizer.helpers import error
+from cauldron_optimizer.admission import OptimizerBusy
+from cauldron_optimizer.config import get_secret_key, get_template_cache_dir, select_locale
+from cauldron_optimizer.helpers import error, translated_names
+from cauldron_optimizer.passwords import HashingBusy
 
 # Create Flask app
 app = Flask(__name__)
@@ -22,10 +24,11 @@ babel = Babel(app, locale_selector=select_locale)
 
 @app.context_processor
 def inject_i18n():
-    """Make translation functions available in templates."""
+    """Make translation functions and the translated name lists available in templates."""
     return {
         "_": _,
         "get_locale": get_locale,
+        "names": translated_names(),
     }
 
 
@@ -50,5 +53,34 @@ def handle_sqlalchemy_error(e):
     return (error(_("Error de base de datos"), url=target), 500)
 
 
-# Import routes after app and extensions are initialized
-from cauldron_optimizer import routes  # noqa: E402, F401
+@app.errorhandler(HashingBusy)
+def handle_hashing_busy(e):
+    """Too many logins/registrations at once: ask the user to retry."""
+    target = request.referrer or url_for("login")
+    return (error(_("Servidor ocupado. Inténtalo de nuevo en unos segundos."), url=target), 503)
+
+
+@app.errorhandler(OptimizerBusy)
+def handle_optimizer_busy(e):
+    """Optimizer at capacity (or the user already has a search running)."""
+    return (
+        error(
+            _("Hay muchas búsquedas en curso. Inténtalo de nuevo en unos segundos."),
+            url=url_for("index"),
+        ),
+        503,
+        {"Retry-After": "5"},
+    )
+
+
+# Import routes and build commands after app and extensions are initialized
+from cauldron_optimizer import cli, compression, profiling, routes  # noqa: E402, F401
+
+# Templates precompiled by `flask build-templates` skip compilation on cold start
+app.jinja_env.bytecode_cache = cli.ShippedBytecodeCache(get_template_cache_dir())
+
+# Opt-in request profiling (no-op unless PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set)
+profiling.install(app)
+
+# Precompressed static files (see `flask build-static`) and compressed HTML
+compression.install(app)
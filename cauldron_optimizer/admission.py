@@ -0,0 +1,99 @@
+"""Cost-aware admission control for optimizer runs.
+
+The cost of a search is estimated as n_starts x neighborhood size (n_free^2
++1/swap moves) x an engine factor. A run is admitted while the in-flight cost
+stays within the budget and the user has fewer than `per_user` runs in flight.
+Under pressure the number of starts is capped (down to `min_starts`); beyond
+that, or for runs that cannot be shortened (partial=False), OptimizerBusy is
+raised so the user gets a clear "busy" answer. A run handed to the solver pool
+that outlives its request (solver timeout) keeps its reservation until the pool
+finishes it (release_when_done).
+"""
+
+import threading
+from collections import defaultdict
+from collections.abc import Hashable
+from contextlib import contextmanager
+
+from cauldron_optimizer.config import get_admission_settings
+
+# relative cost of one start per engine: the "cost/start" line of
+# benchmarks/bench_engines.py (greedy 1.00, annealing 3.01, tabu 0.44), rounded up
+ENGINE_COST = {"greedy": 1.0, "annealing": 3.0, "tabu": 0.5}
+
+
+class OptimizerBusy(Exception):
+    """Raised when a run cannot be admitted."""
+
+
+class AdmissionController:
+    def __init__(self, budget: float, per_user: int, min_starts: int):
+        self.budget = budget
+        self.per_user = per_user
+        self.min_starts = min_starts
+        self._lock = threading.Lock()
+        self._in_flight_cost = 0.0
+        self._in_flight_user: dict[Hashable, int] = defaultdict(int)
+        self._local = threading.local()  # per request thread: futures of its open runs
+        self.rejected = 0
+        self.capped = 0
+
+    @staticmethod
+    def estimate_cost(n_starts: int, n_free: int, engine: str = "greedy") -> float:
+        return n_starts * n_free**2 * ENGINE_COST.get(engine, 1.0)
+
+    @contextmanager
+    def admit(
+        self,
+        user_id: Hashable,
+        n_starts: int,
+        n_free: int,
+        engine: str = "greedy",
+        partial: bool = True,
+    ):
+        """Reserve budget for a run; yields the number of starts granted.
+
+        With partial=False the run is admitted with all its starts or not at all.
+        """
+        per_start = self.estimate_cost(1, n_free, engine)
+        with self._lock:
+            if self._in_flight_user[user_id] >= self.per_user:
+                self.rejected += 1
+                raise OptimizerBusy()
+            available = self.budget - self._in_flight_cost
+            granted = min(n_starts, int(available // per_start))
+            if granted < (min(n_starts, self.min_starts) if partial else n_starts):
+                self.rejected += 1
+                raise OptimizerBusy()
+            if granted < n_starts:
+                self.capped += 1
+            cost = granted * per_start
+            self._in_flight_cost += cost
+            self._in_flight_user[user_id] += 1
+        stack = self._local.__dict__.setdefault("stack", [])
+        pending = []
+        stack.append(pending)
+        try:
+            yield granted
+        finally:
+            stack.pop()
+            if pending:
+                pending[0].add_done_callback(lambda _: self._release(user_id, cost))
+            else:
+                self._release(user_id, cost)
+
+    def release_when_done(self, future) -> None:
+        """Keep the current thread's innermost run reserved until `future` is done."""
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            stack[-1].append(future)
+
+    def _release(self, user_id: Hashable, cost: float) -> None:
+        with self._lock:
+            self._in_flight_cost -= cost
+            self._in_flight_user[user_id] -= 1
+            if self._in_flight_user[user_id] <= 0:
+                del self._in_flight_user[user_id]
+
+
+admission = AdmissionController(**get_admission_settings())
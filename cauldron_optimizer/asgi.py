@@ -0,0 +1,156 @@
+"""ASGI serving mode:
+
+    uvicorn cauldron_optimizer.asgi:app
+
+The event loop owns the connections (parsing, keep-alive, slow clients). Flask
+views block, so each request runs on a pool of ASGI_IO_THREADS threads that
+mostly wait on the database and render pages. Optimizer solves are sent on from
+those threads to the solver process pool (see solver.py), with SOLVER_WORKERS
+processes (default: one per CPU). A running search therefore holds a waiting
+thread, but not the CPU or GIL of the serving process, and cheap requests
+(/results, /lang/<lang>, static files) keep flowing while it runs.
+
+asgiref's WsgiToAsgi is not used: it runs every WSGI call on one shared thread.
+"""
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from cauldron_optimizer import app as flask_app
+from cauldron_optimizer import solver
+from cauldron_optimizer.config import get_asgi_settings, get_solver_settings
+
+
+class WSGIBridge:
+    """Serve a WSGI app from ASGI, running requests on a dedicated thread pool."""
+
+    def __init__(self, wsgi_app, io_threads: int, solver_workers: int):
+        self.wsgi_app = wsgi_app
+        self.solver_workers = solver_workers
+        self._pool = ThreadPoolExecutor(io_threads, thread_name_prefix="asgi-io")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return  # no websockets
+
+        body = SpooledTemporaryFile(max_size=1 << 20)
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                body.close()
+                return
+            body.write(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body.seek(0)
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._pool, self._run, loop, scope, body, send)
+        finally:
+            body.close()
+
+    async def _lifespan(self, receive, send):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await loop.run_in_executor(None, solver.start, self.solver_workers)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await loop.run_in_executor(None, solver.shutdown)
+                self._pool.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _run(self, loop, scope, body, send) -> None:
+        """Call the WSGI app (on a pool thread), forwarding its output to the loop."""
+
+        def emit(message: dict) -> None:
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response_start = None
+        started = False
+
+        def start_response(status, headers, exc_info=None):
+            nonlocal response_start
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_start = {
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers
+                ],
+            }
+            return write
+
+        def write(data: bytes) -> None:
+            nonlocal started
+            if not started:
+                emit(response_start)
+                started = True
+            if data:
+                emit({"type": "http.response.body", "body": data, "more_body": True})
+
+        result = self.wsgi_app(_environ(scope, body), start_response)
+        try:
+            for chunk in result:
+                write(chunk)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        write(b"")
+        emit({"type": "http.response.body"})
+
+
+def _environ(scope: dict, body) -> dict:
+    """PEP 3333 environ for an ASGI HTTP scope."""
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path) :]
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path,
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "REMOTE_ADDR": client[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        name, value = name.decode("latin-1"), value.decode("latin-1")
+        if name == "content-length":
+            key = "CONTENT_LENGTH"
+        elif name == "content-type":
+            key = "CONTENT_TYPE"
+        else:
+            key = "HTTP_" + name.upper().replace("-", "_")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+app = WSGIBridge(
+    flask_app,
+    io_threads=get_asgi_settings()["io_threads"],
+    solver_workers=get_solver_settings()["workers"] or os.cpu_count() or 1,
+)
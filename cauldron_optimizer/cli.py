@@ -0,0 +1,66 @@
+"""Build commands, run at deploy time: `flask --app cauldron_optimizer <command>`."""
+
+import os
+
+import click
+from jinja2 import FileSystemBytecodeCache
+
+from cauldron_optimizer import app
+from cauldron_optimizer.compression import available_encodings, build_static_variants
+from cauldron_optimizer.sprites import build_sprites
+
+
+class ShippedBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache built at deploy time; tolerates a read-only filesystem."""
+
+    _warned = False
+
+    def dump_bytecode(self, bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as exc:
+            # e.g. serverless runtime: keep the compiled template in memory, but say
+            # once that the deploy shipped no cache (build-templates did not run)
+            if not self._warned:
+                self._warned = True
+                app.logger.warning(
+                    "cannot write template cache %s (%s); run build-templates at deploy",
+                    self.directory,
+                    exc.strerror,
+                )
+
+
+@app.cli.command("build-templates")
+def build_templates():
+    """Precompile all templates into the Jinja bytecode cache."""
+    cache = app.jinja_env.bytecode_cache
+    os.makedirs(cache.directory, exist_ok=True)
+    cache.clear()
+    names = app.jinja_env.list_templates(extensions=["html"])
+    for name in names:
+        app.jinja_env.get_template(name)
+    click.echo(f"compiled {len(names)} templates into {cache.directory}")
+
+
+@app.cli.command("build-static")
+def build_static():
+    """Write precompressed .br/.gz variants of the static files."""
+    report = build_static_variants(app.static_folder)
+    total = sum(size for _, size, _ in report)
+    for enc in available_encodings():
+        kept = [(size, sizes[enc]) for _, size, sizes in report if enc in sizes]
+        before = sum(size for size, _ in kept)
+        after = sum(out for _, out in kept)
+        click.echo(f"{enc}: {len(kept)}/{len(report)} files, {before} -> {after} bytes")
+    click.echo(f"static folder: {len(report)} files, {total} bytes")
+
+
+@app.cli.command("build-sprites")
+def build_sprites_command():
+    """Pack the ingredient and effect icons into sprite sheets (needs Pillow)."""
+    try:
+        report = build_sprites(app.static_folder)
+    except ImportError as exc:
+        raise click.ClickException("build-sprites needs Pillow: pip install Pillow") from exc
+    for path, n_icons, size in report:
+        click.echo(f"{path}: {n_icons} icons, {size} bytes")
@@ -0,0 +1,125 @@
+"""Response compression.
+
+Static files: `flask build-static` writes .br (when the optional brotli package
+is installed) and .gz variants next to the compressible files in static/, and
+the static route serves the best variant the client accepts, so there is no
+compression work per request. Without variants files are served as before.
+
+Dynamic HTML and JSON responses of at least COMPRESS_MIN_SIZE bytes are
+compressed on the fly at the cheap COMPRESS_LEVELS.
+"""
+
+import gzip
+import mimetypes
+import os
+from functools import lru_cache
+
+from flask import request, send_from_directory
+
+from cauldron_optimizer.constants import COMPRESS_LEVELS, COMPRESS_MIN_SIZE, STATIC_MIN_GAIN
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+ENCODINGS = ("br", "gzip")  # in order of preference
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+DYNAMIC_MIMETYPES = {"text/html", "application/json"}  # e.g. /frontier
+
+
+def available_encodings() -> tuple[str, ...]:
+    return tuple(enc for enc in ENCODINGS if enc != "br" or brotli is not None)
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def build_static_variants(static_folder: str) -> list[tuple[str, int, dict[str, int]]]:
+    """
+    Write max-level variants of every static file they shrink by STATIC_MIN_GAIN or
+    more (already compressed formats such as most PNGs are skipped this way), and
+    remove stale ones. Returns [(relative path, size, {encoding: variant size})].
+    """
+    max_levels = {"br": 11, "gzip": 9}
+    report = []
+    for root, _, files in os.walk(static_folder):
+        for name in sorted(files):
+            if name.endswith(tuple(SUFFIXES.values())):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            sizes = {}
+            for enc in available_encodings():
+                variant = path + SUFFIXES[enc]
+                out = compress(data, enc, max_levels[enc])
+                if len(out) <= (1 - STATIC_MIN_GAIN) * len(data):
+                    with open(variant, "wb") as f:
+                        f.write(out)
+                    sizes[enc] = len(out)
+                elif os.path.exists(variant):
+                    os.remove(variant)
+            report.append((os.path.relpath(path, static_folder), len(data), sizes))
+    return report
+
+
+def _accepted() -> list[str]:
+    """Encodings the client accepts, in our order of preference."""
+    return [enc for enc in ENCODINGS if request.accept_encodings[enc]]
+
+
+@lru_cache(maxsize=4096)
+def _has_variant(static_folder: str, filename: str, encoding: str) -> bool:
+    # variants are built at deploy time, so existence is cached per process
+    return os.path.isfile(os.path.join(static_folder, filename + SUFFIXES[encoding]))
+
+
+def _static_view(app):
+    def static(filename: str):
+        for enc in _accepted():
+            if _has_variant(app.static_folder, filename, enc):
+                response = send_from_directory(
+                    app.static_folder,
+                    filename + SUFFIXES[enc],
+                    mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                    max_age=app.get_send_file_max_age(filename),
+                )
+                response.headers["Content-Encoding"] = enc
+                break
+        else:
+            response = app.send_static_file(filename)
+        response.vary.add("Accept-Encoding")
+        return response
+
+    return static
+
+
+def _compress_dynamic(response):
+    if (
+        response.mimetype not in DYNAMIC_MIMETYPES
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    response.vary.add("Accept-Encoding")
+    for enc in _accepted():
+        if enc in available_encodings():
+            response.set_data(compress(data, enc, COMPRESS_LEVELS[enc]))
+            response.headers["Content-Encoding"] = enc
+            break
+    return response
+
+
+def install(app) -> None:
+    """Serve precompressed static variants and compress large dynamic responses."""
+    app.view_functions["static"] = _static_view(app)
+    app.after_request(_compress_dynamic)
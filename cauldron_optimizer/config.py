@@ -1,9 +1,12 @@
 """Configuration utilities for Cauldron Optimizer."""
 
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
+from cauldron_optimizer.constants import LANGUAGES
+
 # Load environment variables from .env (root) for local/dev
 load_dotenv()
 
@@ -12,16 +15,96 @@ def get_secret_key() -> str:
     return os.environ["SECRET_KEY"]
 
 
+def get_template_cache_dir() -> str:
+    """Directory of the precompiled Jinja bytecode cache (see `flask build-templates`)."""
+    return os.environ.get(
+        "TEMPLATE_CACHE_DIR", os.path.join(os.path.dirname(__file__), "jinja_cache")
+    )
+
+
 def get_database_url() -> str:
-    return os.environ["NEONDB_USER"]
+    # DATABASE_URL overrides Neon, e.g. sqlite:///loadtest.db for a local stand-in
+    return os.environ.get("DATABASE_URL") or os.environ["NEONDB_USER"]
+
+
+def get_pooled_database_url() -> str | None:
+    """URL of an external pgbouncer-style pooler (e.g. Neon's -pooler host), if any."""
+    return os.environ.get("DATABASE_POOLED_URL") or None
+
+
+def get_db_pool_settings() -> dict:
+    """Connection pool sizing; small defaults suit short-lived serverless instances."""
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 2)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 3)),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        # recycle before Neon's idle timeout drops the connection server side
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 240)),
+        # connections idle longer than this are checked on checkout
+        "idle_ping": float(os.environ.get("DB_IDLE_PING", 60)),
+    }
+
+
+def get_password_hash_settings() -> dict:
+    """Password hashing policy (a werkzeug method string) and its worker pool size."""
+    return {
+        "method": os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1"),
+        # max hashes computed at once, and how many more may wait for a worker
+        "workers": int(os.environ.get("PASSWORD_HASH_WORKERS", 2)),
+        "queue": int(os.environ.get("PASSWORD_HASH_QUEUE", 16)),
+        "timeout": float(os.environ.get("PASSWORD_HASH_TIMEOUT", 5)),
+    }
+
+
+def get_admission_settings() -> dict:
+    """Admission control for /optimize (costs in start x neighborhood units)."""
+    return {
+        # in-flight cost allowed per process, default: 4 full-depth searches
+        "budget": float(os.environ.get("ADMISSION_BUDGET", 4 * 100 * 12**2)),
+        "per_user": int(os.environ.get("ADMISSION_PER_USER", 1)),
+        # under pressure, searches are capped down to this many starts before refusing
+        "min_starts": int(os.environ.get("ADMISSION_MIN_STARTS", 5)),
+    }
+
+
+def get_admin_usernames() -> set[str]:
+    """Users allowed on admin pages (comma-separated ADMIN_USERS)."""
+    return {u.strip() for u in os.environ.get("ADMIN_USERS", "").split(",") if u.strip()}
+
+
+def get_profiling_settings() -> dict:
+    """Opt-in request profiling: by X-Profile-Token header and/or a sampling rate."""
+    return {
+        "token": os.environ.get("PROFILE_TOKEN") or None,
+        "sample_rate": float(os.environ.get("PROFILE_SAMPLE_RATE", 0)),
+        "dir": os.environ.get(
+            "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "cauldron_profiles")
+        ),
+        "keep": int(os.environ.get("PROFILE_KEEP", 50)),
+    }
+
+
+def get_solver_settings() -> dict:
+    """CPU executor for optimizer solves; 0 workers solves in the request thread."""
+    return {
+        "workers": int(os.environ.get("SOLVER_WORKERS", 0)),
+        "timeout": float(os.environ.get("SOLVER_TIMEOUT", 60)),
+        # CPU priority drop of pool processes (> 0 favors page requests on small instances)
+        "nice": int(os.environ.get("SOLVER_NICE", 0)),
+    }
+
+
+def get_asgi_settings() -> dict:
+    """ASGI serving mode: threads running the (blocking) Flask views."""
+    return {
+        "io_threads": int(os.environ.get("ASGI_IO_THREADS", 16)),
+    }
 
 
 def select_locale():
     """Select the best locale for the current request."""
     from flask import request, session
 
-    from cauldron_optimizer.constants import LANGUAGES
-
     # 1) Override manual: /?lang=en o /?lang=es
     lang = request.args.get("lang")
     if lang in LANGUAGES:
@@ -54,6 +54,25 @@ EFFECT_NAMES = [
 
 N_INGREDIENTS = len(INGREDIENT_NAMES)
 MAX_STARTS = 100
+START_METHOD = "relaxation"  # multistart start generator: "random" or "relaxation"
+SEARCH_ENGINE = "tabu"  # default engine, see CauldronOptimizer.engines
+OPTIMIZER_REGISTRY_SIZE = 64  # warm optimizer structures kept across requests
+BULK_CHUNK_SIZE = 1024  # recipes scored per matrix product in /formula/bulk
+MAX_BREWS = 1000
+SIMULATION_TIME_BUDGET = 0.2  # seconds of Monte Carlo sampling per request
+MAX_PLAN_BREWS = 100  # brews per inventory plan
+PLAN_STARTS = 5  # multistart starts per lattice point of the planner
+PLAN_TIME_BUDGET = 2.0  # seconds of lattice solves per plan
+PLAN_MAX_SOLVES = 40  # lattice solves per plan, about what PLAN_TIME_BUDGET allows
+FRONTIER_WEIGHTS = 96  # weight vectors solved per weight-response frontier
+FRONTIER_STARTS = 1  # extra starts per frontier weight vector
+FRONTIER_TIME_BUDGET = 1.0  # seconds per frontier (computed once per structure)
+# frontiers computed before forking gunicorn workers: new accounts' default structure
+# (n_diploma, premium ingredients, alpha_UB, prob_UB)
+PRELOAD_FRONTIERS = [(4, (), 25, 100)]
+COMPRESS_MIN_SIZE = 1024  # bytes; smaller HTML responses are sent uncompressed
+COMPRESS_LEVELS = {"br": 1, "gzip": 1}  # on-the-fly HTML: cheapest levels, ~4x smaller
+STATIC_MIN_GAIN = 0.1  # precompressed static variants are kept only if 10% smaller
 DEFAULTS = {
     "effect_weights": "[0, 0, 0, 0]",
     "max_ingredients": 25,
@@ -66,3 +85,4 @@ DEFAULTS = {
 # 1- Add the hiddend B and V values to the corresponding CSV files in optimizer/
 # 2- ADD IT TO EFFECT_NAMES
 # 3- add the effect icon in /static/effects/effect{chapter_number}.png
+# 4- rebuild the sprite sheets: flask --app cauldron_optimizer build-sprites (needs Pillow)
@@ -1,21 +1,133 @@
 """Database session management."""
 
+import threading
+import time
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from flask import g, has_request_context
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from cauldron_optimizer.config import get_database_url
+from cauldron_optimizer.config import (
+    get_database_url,
+    get_db_pool_settings,
+    get_pooled_database_url,
+)
 
-engine = create_engine(get_database_url(), pool_pre_ping=True)
+
+class PoolMetrics:
+    """Counters for connection checkouts, (re)connects and pool occupancy."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.checkout_max_seconds = 0.0
+        self.connects = 0
+        self.stale = 0  # idle connections found dead on checkout
+        self.invalidated = 0  # connections discarded and replaced (includes stale)
+
+    def record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds += seconds
+            self.checkout_max_seconds = max(self.checkout_max_seconds, seconds)
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict:
+        pool = engine.pool
+        with self._lock:
+            return {
+                "pool": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "checkouts": self.checkouts,
+                "checkout_avg_ms": 1000 * self.checkout_seconds / max(self.checkouts, 1),
+                "checkout_max_ms": 1000 * self.checkout_max_seconds,
+                "connects": self.connects,
+                "reconnects": self.invalidated,
+                "stale": self.stale,
+            }
+
+
+def _create_engine():
+    settings = get_db_pool_settings()
+    pooled_url = get_pooled_database_url()
+    if pooled_url:
+        # the external pooler keeps the server connections; hold none here
+        return create_engine(pooled_url, poolclass=NullPool), settings
+
+    url = make_url(get_database_url())
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return create_engine(url), settings
+    return (
+        create_engine(
+            url,
+            pool_size=settings["pool_size"],
+            max_overflow=settings["max_overflow"],
+            pool_timeout=settings["pool_timeout"],
+            pool_recycle=settings["pool_recycle"],
+        ),
+        settings,
+    )
+
+
+metrics = PoolMetrics()
+engine, _pool_settings = _create_engine()
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_conn, record):
+    metrics.incr("connects")
+    record.info["last_used"] = time.monotonic()
+
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(dbapi_conn, record):
+    record.info["last_used"] = time.monotonic()
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_conn, record, proxy):
+    """Optimistic checkout: only connections idle for a while are pinged.
+
+    Raising DisconnectionError makes the pool discard the connection and retry
+    the checkout with a fresh one, instead of failing the request.
+    """
+    if time.monotonic() - record.info.get("last_used", 0.0) < _pool_settings["idle_ping"]:
+        return
+    try:
+        cursor = dbapi_conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.close()
+    except Exception:
+        metrics.incr("stale")
+        raise exc.DisconnectionError()
+
+
+@event.listens_for(engine, "invalidate")
+def _on_invalidate(dbapi_conn, record, exception):
+    metrics.incr("invalidated")
+
+
 @contextmanager
 def db_session():
     """Context manager for database sessions with automatic commit/rollback."""
     db = SessionLocal()
     try:
+        # check out eagerly so the checkout latency can be measured
+        t0 = time.perf_counter()
+        db.connection()
+        elapsed = time.perf_counter() - t0
+        metrics.record_checkout(elapsed)
+        if has_request_context():
+            g.db_checkout_ms = g.get("db_checkout_ms", 0.0) + 1000 * elapsed
         yield db
         db.commit()
     except Exception:
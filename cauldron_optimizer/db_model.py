@@ -1,14 +1,20 @@
-from sqlalchemy import TIMESTAMP, BigInteger, ForeignKey, Integer, Text, func
+from sqlalchemy import JSON, TIMESTAMP, BigInteger, ForeignKey, Integer, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column, relationship
-from werkzeug.security import check_password_hash, generate_password_hash
+
+from cauldron_optimizer.passwords import hash_password, needs_rehash, verify_password
 
 Base = declarative_base()
 
+# Postgres types, with SQLite-compatible variants for local stand-in databases
+# (SQLite only autoincrements INTEGER primary keys)
+BigIntegerType = BigInteger().with_variant(Integer, "sqlite")
+JSONBType = JSONB().with_variant(JSON, "sqlite")
+
 
 class User(Base):
     __tablename__ = "users"
-    id: Mapped[BigInteger] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[BigInteger] = mapped_column(BigIntegerType, primary_key=True)
     username: Mapped[Text] = mapped_column(Text, unique=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(Text, nullable=False)
     settings = relationship(
@@ -24,19 +30,24 @@ class User(Base):
 
     @password.setter
     def password(self, password_plaintext: str):
-        self.password_hash = generate_password_hash(password_plaintext)
+        self.password_hash = hash_password(password_plaintext)
 
     def check_password(self, attempted_password: str) -> bool:
-        return check_password_hash(self.password_hash, attempted_password)
+        if not verify_password(self.password_hash, attempted_password):
+            return False
+        # upgrade hashes made under an older policy (committed with the session)
+        if needs_rehash(self.password_hash):
+            self.password = attempted_password
+        return True
 
 
 class UserSettings(Base):
     __tablename__ = "user_settings"
     user_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+        BigIntegerType, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
     effect_weights: Mapped[list[int]] = mapped_column(
-        JSONB, nullable=False, server_default="[0,0,0,0]"
+        JSONBType, nullable=False, server_default="[0,0,0,0]"
     )
     max_ingredients: Mapped[int] = mapped_column(
         Integer, nullable=False, server_default="25"
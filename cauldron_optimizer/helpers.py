@@ -1,8 +1,15 @@
-from functools import wraps
+import csv
+import io
+import json
+from functools import cache, wraps
 
-from flask import redirect, render_template, session
+from flask import abort, redirect, render_template, session
+from flask_babel import get_locale
 from flask_babel import gettext as _
 
+from cauldron_optimizer.config import get_admin_usernames
+from cauldron_optimizer.constants import EFFECT_NAMES, INGREDIENT_NAMES, N_INGREDIENTS
+
 
 # this may be enhenced later using bootstrap Modal dialogs
 def error(text, url="/"):
@@ -26,6 +33,22 @@ def login_required(f):
     return decorated_function
 
 
+def admin_required(f):
+    """
+    Decorate routes to require an admin user (ADMIN_USERS).
+    """
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if session.get("user_id") is None:
+            return redirect("/login")
+        if session.get("username") not in get_admin_usernames():
+            abort(404)
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
 def first_form_error(form) -> str:
     """Return the first validation error message, with CSRF handled first."""
     if "csrf_token" in form.errors:
@@ -37,3 +60,46 @@ def first_form_error(form) -> str:
         return errors[0]
 
     return _("Formulario inválido")
+
+
+def iter_recipe_rows(upload):
+    """Yield recipes (lists of N_INGREDIENTS ints) from an uploaded file.
+
+    CSV and JSON Lines files are read line by line; a .json file must hold a
+    list of recipes and is loaded at once. A non-numeric CSV header is skipped.
+    """
+    filename = (upload.filename or "").lower()
+    text = io.TextIOWrapper(upload.stream, encoding="utf-8-sig")
+    if filename.endswith(".json"):
+        rows = enumerate(json.load(text), start=1)
+    elif filename.endswith(".jsonl"):
+        rows = ((n, json.loads(line)) for n, line in enumerate(text, start=1) if line.strip())
+    else:
+        rows = ((n, row) for n, row in enumerate(csv.reader(text), start=1) if row)
+
+    for n, row in rows:
+        try:
+            values = [int(x) for x in row]
+        except (TypeError, ValueError):
+            if n == 1 and not filename.endswith((".json", ".jsonl")):
+                continue  # header
+            raise ValueError(_("Fila {}: los valores deben ser enteros").format(n))
+        if len(values) != N_INGREDIENTS:
+            raise ValueError(
+                _("Fila {}: se esperaban {} ingredientes").format(n, N_INGREDIENTS)
+            )
+        yield values
+
+
+def translated_names() -> dict[str, tuple[str, ...]]:
+    """Effect and ingredient names in the current locale (translated once per locale)."""
+    return _translated_names(str(get_locale()))
+
+
+@cache
+def _translated_names(locale: str) -> dict[str, tuple[str, ...]]:
+    # gettext uses the current request's locale, which is `locale`
+    return {
+        "effects": tuple(_(name) for name in EFFECT_NAMES),
+        "ingredients": tuple(_(name) for name in INGREDIENT_NAMES),
+    }
@@ -1,3 +1,6 @@
+import copy
+import threading
+import time
 from pathlib import Path
 
 import numpy as np
@@ -5,6 +8,10 @@ import numpy as np
 BASE_DIR = Path(__file__).resolve().parent
 B = np.loadtxt(BASE_DIR / "B_values.csv", delimiter=",", skiprows=1)
 V = np.loadtxt(BASE_DIR / "V_values.csv", delimiter=",", skiprows=1)
+# loaded once per process (once per server when preloaded, see prefork.py); read-only
+# so that forked workers keep sharing the pages
+B.setflags(write=False)
+V.setflags(write=False)
 
 
 class CauldronOptimizer:
@@ -19,7 +26,6 @@ class CauldronOptimizer:
         premium_ingr: list[int] = [],
         alpha_UB: int | None = None,
         prob_UB: int = 100,
-        cache_max_size: int = 1_000_000,
     ):
         effect_weights = np.asarray(effect_weights, dtype=float)
         if alpha_UB is None:
@@ -37,27 +43,79 @@ class CauldronOptimizer:
         self.B = self.B_full[: self.n_dipl, self.free_idx]
         self.V = self.V_full[: self.n_dipl, self.free_idx]
 
-        # normalized weights (guard divide by 0)
-        s = effect_weights.sum()
-        if s == 0:
-            effect_weights = np.full(self.n_dipl, 1.0 / self.n_dipl, dtype=float)
-        self.w = effect_weights / s
-
         # alpha upper bounds (reduced)
         self.alpha_UB = np.full(self.n_freeingr, int(alpha_UB), dtype=int)
         self.prob_UB = np.full(self.n_dipl, float(prob_UB), dtype=float)
 
-        # objective cache
-        self._obj_cache: dict[tuple[int, ...], float] = {}
-        self._cache_max_size = int(cache_max_size)
+        # best recipes found so far for this structure, as {reduced alpha: capped probs};
+        # re-scored under new weights to warm-start later solves. Copies from
+        # with_weights() share the dict and its lock (requests run in threads)
+        self._elite: dict[tuple[int, ...], np.ndarray] = {}
+        self._elite_lock = threading.Lock()
+        self._elite_max_size = 64
 
-    # ------------- greedy local search -------------
-    def greedy(self, start_alpha: np.ndarray | None = None, allow_mass_moves: bool = True):
-        n_ingr = self.n_freeingr
+        # relaxed optimum for smart starts (computed lazily)
+        self._relaxed: np.ndarray | None = None
+
+        # number of greedy moves applied (for benchmarking start strategies)
+        self.n_moves = 0
 
+        # normalized weights
+        self.set_weights(effect_weights)
+
+    def set_weights(self, effect_weights: np.ndarray) -> None:
+        """
+        Swap the weight vector, keeping the V/B slices and bounds of this instance.
+        """
+        effect_weights = np.asarray(effect_weights, dtype=float)
+        assert len(effect_weights) == self.n_dipl, "len(effect_weights) != n_dipl"
+
+        # guard divide by 0
+        s = effect_weights.sum()
+        if s == 0:
+            effect_weights = np.ones(self.n_dipl, dtype=float)
+            s = float(self.n_dipl)
+        self.w = effect_weights / s
+
+        # the relaxed optimum depends on the weights
+        self._relaxed = None
+
+    def with_weights(self, effect_weights: np.ndarray) -> "CauldronOptimizer":
+        """
+        Copy sharing this instance's structure (V/B slices, bounds and elite
+        recipes) with its own weight vector.
+        """
+        opt = copy.copy(self)
+        opt.n_moves = 0
+        opt.set_weights(effect_weights)
+        return opt
+
+    def with_bounds(self, alpha_UB: np.ndarray) -> "CauldronOptimizer":
+        """
+        Copy sharing this instance's structure and weights, with per-ingredient upper
+        bounds alpha_UB (full length, n_ingredients) tightened into its own bounds.
+        Its elite recipes are its own, starting from those within the new bounds, so
+        bounded optima never become starts of the unbounded structure.
+        """
+        opt = copy.copy(self)
+        opt.n_moves = 0
+        ub = np.broadcast_to(np.asarray(alpha_UB, dtype=int), (self.n_ingredients,))
+        opt.alpha_UB = np.minimum(self.alpha_UB, ub[self.free_idx])
+        opt._elite = {
+            key: probs
+            for key, probs in self._elite_items()
+            if (np.array(key) <= opt.alpha_UB).all()
+        }
+        opt._elite_lock = threading.Lock()
+        opt._relaxed = None
+        return opt
+
+    # ------------- search state -------------
+    def _init_state(self, start_alpha: np.ndarray | None):
+        """Feasible reduced alpha from a start point, with its (Sv, Sb, total)."""
         # ---- initialize alpha (reduced) ----
         if start_alpha is None:
-            start_alpha = np.zeros(n_ingr, dtype=int)
+            start_alpha = np.zeros(self.n_freeingr, dtype=int)
 
         alpha = np.clip(start_alpha, 0, self.alpha_UB)
 
@@ -73,6 +131,18 @@ class CauldronOptimizer:
         total = alpha.sum()
         Sv = self.V @ alpha.astype(float)
         Sb = self.B @ alpha.astype(float)
+        return alpha, Sv, Sb, total
+
+    def _expand(self, alpha: np.ndarray) -> np.ndarray:
+        """Expand a reduced alpha back to full length (12)."""
+        alpha_full = np.zeros(self.n_ingredients, dtype=int)
+        alpha_full[self.free_idx] = alpha
+        return alpha_full
+
+    # ------------- greedy local search -------------
+    def greedy(self, start_alpha: np.ndarray | None = None, allow_mass_moves: bool = True):
+        n_ingr = self.n_freeingr
+        alpha, Sv, Sb, total = self._init_state(start_alpha)
         current_val = self._objective_from_SvSb(Sv, Sb, total)
 
         # ---- steepest-ascent loop ----
@@ -143,42 +213,487 @@ class CauldronOptimizer:
 
                 current_val = best_val
                 improved = True
+                self.n_moves += 1
 
         # expand back to full alpha (12-length)
-        alpha_full = np.zeros(self.n_ingredients, dtype=int)
-        alpha_full[self.free_idx] = alpha
-        return alpha_full, current_val
+        return self._expand(alpha), current_val
 
-    # ------------- multi-start wrapper -------------
+    # ------------- simulated annealing -------------
+    def annealing(
+        self,
+        start_alpha: np.ndarray | None = None,
+        allow_mass_moves: bool = True,
+        n_iter: int = 1500,
+        T0: float = 1.0,
+        T_end: float = 1e-3,
+    ):
+        """
+        Simulated annealing over random +1 / -1 / swap moves with a geometric
+        cooling schedule from T0 to T_end (in objective units). The best visited
+        recipe is polished with greedy.
+        """
+        n_ingr = self.n_freeingr
+        alpha, Sv, Sb, total = self._init_state(start_alpha)
+        current_val = self._objective_from_SvSb(Sv, Sb, total)
+        best_alpha, best_val = alpha.copy(), current_val
+
+        # draw all random numbers up front
+        n_types = 3 if allow_mass_moves else 2
+        move_type = np.random.randint(n_types, size=n_iter)
+        ks = np.random.randint(n_ingr, size=n_iter)
+        js = np.random.randint(n_ingr, size=n_iter)
+        log_u = np.log(np.random.random(n_iter))
+        temps = T0 * (T_end / T0) ** (np.arange(n_iter) / max(n_iter - 1, 1))
+
+        for it in range(n_iter):
+            k, j = ks[it], js[it]
+            if move_type[it] == 0:  # +1 on j
+                if total >= self.sum_ingredients or alpha[j] >= self.alpha_UB[j]:
+                    continue
+                dv, db, dt = self.V[:, j], self.B[:, j], 1
+            elif move_type[it] == 1:  # -1 on k
+                if alpha[k] <= 0:
+                    continue
+                dv, db, dt = -self.V[:, k], -self.B[:, k], -1
+            else:  # swap k -> j
+                if k == j or alpha[k] <= 0 or alpha[j] >= self.alpha_UB[j]:
+                    continue
+                dv = self.V[:, j] - self.V[:, k]
+                db = self.B[:, j] - self.B[:, k]
+                dt = 0
+
+            val = self._objective_from_SvSb(Sv + dv, Sb + db, total + dt)
+            delta = val - current_val
+            if delta >= 0 or log_u[it] < delta / temps[it]:
+                if move_type[it] != 0:
+                    alpha[k] -= 1
+                if move_type[it] != 1:
+                    alpha[j] += 1
+                Sv, Sb, total = Sv + dv, Sb + db, total + dt
+                current_val = val
+                self.n_moves += 1
+                if val > best_val:
+                    best_alpha, best_val = alpha.copy(), val
 
-    def multistart(self, n_starts: int = 20, allow_mass_moves: bool = True):
-        best_alpha = None
-        best_val = -1e18
+        return self.greedy(start_alpha=best_alpha, allow_mass_moves=allow_mass_moves)
+
+    # ------------- tabu search -------------
+    def tabu(
+        self,
+        start_alpha: np.ndarray | None = None,
+        allow_mass_moves: bool = True,
+        n_iter: int = 60,
+        tenure: int = 5,
+        patience: int = 15,
+    ):
+        """
+        Tabu search: always take the best non-tabu +1 / -1 / swap move, even if it
+        worsens the objective. An ingredient that was decreased may not be increased
+        (and vice versa) for `tenure` iterations, unless the move beats the best
+        recipe found (aspiration). Stops after n_iter moves or `patience` moves
+        without improving the best. The whole neighborhood is scored in one batch.
+        """
         n_ingr = self.n_freeingr
+        alpha, Sv, Sb, total = self._init_state(start_alpha)
+        current_val = self._objective_from_SvSb(Sv, Sb, total)
+        best_alpha, best_val = alpha.copy(), current_val
+
+        # candidate moves as (k, j): k = -1 means "+1 on j", j = -1 means "-1 on k"
+        ar = np.arange(n_ingr)
+        add_moves = np.stack([np.full(n_ingr, -1), ar], axis=1)
+        rem_moves = np.stack([ar, np.full(n_ingr, -1)], axis=1)
+        kk, jj = np.meshgrid(ar, ar, indexing="ij")
+        swap_moves = np.stack([kk.ravel(), jj.ravel()], axis=1)
+        swap_moves = swap_moves[swap_moves[:, 0] != swap_moves[:, 1]]
+        moves = np.concatenate(
+            [add_moves, rem_moves] + ([swap_moves] if allow_mass_moves else [])
+        )
+        k_idx, j_idx = moves[:, 0], moves[:, 1]
+        has_k, has_j = k_idx >= 0, j_idx >= 0
+
+        # per-move deltas on (Sv, Sb, total)
+        V0 = np.hstack([self.V, np.zeros((self.n_dipl, 1))])  # column -1 is zero
+        B0 = np.hstack([self.B, np.zeros((self.n_dipl, 1))])
+        dV = (V0[:, j_idx] - V0[:, k_idx]).T
+        dB = (B0[:, j_idx] - B0[:, k_idx]).T
+        dT = has_j.astype(int) - has_k.astype(int)
+
+        no_inc_until = np.zeros(n_ingr, dtype=int)  # tabu on increasing
+        no_dec_until = np.zeros(n_ingr, dtype=int)  # tabu on decreasing
+        stall = 0
+
+        for it in range(n_iter):
+            feasible = (total + dT <= self.sum_ingredients) & (total + dT >= 0)
+            feasible &= ~has_k | (alpha[k_idx] > 0)
+            feasible &= ~has_j | (alpha[j_idx] < self.alpha_UB[j_idx])
+            if not feasible.any():
+                break
+
+            vals = self._objective_from_SvSb_batch(Sv + dV, Sb + dB, total + dT)
+            is_tabu = (has_j & (no_inc_until[j_idx] > it)) | (
+                has_k & (no_dec_until[k_idx] > it)
+            )
+            allowed = feasible & (~is_tabu | (vals > best_val + 1e-12))
+            if not allowed.any():
+                break
+            m = int(np.argmax(np.where(allowed, vals, -np.inf)))
+
+            k, j = k_idx[m], j_idx[m]
+            if k >= 0:
+                alpha[k] -= 1
+                no_inc_until[k] = it + 1 + tenure
+            if j >= 0:
+                alpha[j] += 1
+                no_dec_until[j] = it + 1 + tenure
+            Sv, Sb, total = Sv + dV[m], Sb + dB[m], total + dT[m]
+            current_val = vals[m]
+            self.n_moves += 1
+
+            if current_val > best_val + 1e-12:
+                best_alpha, best_val = alpha.copy(), current_val
+                stall = 0
+            else:
+                stall += 1
+                if stall >= patience:
+                    break
+
+        return self._expand(best_alpha), best_val
 
-        for _ in range(n_starts):
-            alpha0 = np.zeros(n_ingr, dtype=int)
-            remaining = np.random.randint(1, self.sum_ingredients + 1)
+    # ------------- multi-start wrapper -------------
+
+    engines = ("greedy", "annealing", "tabu")
+
+    def multistart(
+        self,
+        n_starts: int = 20,
+        allow_mass_moves: bool = True,
+        starts: str = "random",
+        engine: str = "greedy",
+    ):
+        """
+        Run a search engine from n_starts start points and keep the best result.
+        starts: "random" (random mass dumps) or "relaxation" (randomized rounding
+        around the optimum of the continuous relaxation).
+        engine: one of `engines`; each maps to the method of the same name, with
+        signature (start_alpha, allow_mass_moves) -> (alpha_full, val).
+        """
+        if starts == "random":
+            start_fn = self._random_start
+        elif starts == "relaxation":
+            start_fn = self._relaxation_start
+        else:
+            raise ValueError(f"unknown start method: {starts}")
+        if engine not in self.engines:
+            raise ValueError(f"unknown search engine: {engine}")
+        search = getattr(self, engine)
 
-            # avoid infinite loops if all UBs reached
+        best_alpha = None
+        best_val = -1e18
 
-            free = np.where(self.alpha_UB - alpha0 > 0)[0]
-            while remaining > 0 and free.size > 0:
-                j = np.random.choice(free)
-                cap = self.alpha_UB[j] - alpha0[j]
-                add = np.random.randint(1, min(remaining, cap) + 1)
-                alpha0[j] += add
-                remaining -= add
-                if alpha0[j] >= self.alpha_UB[j]:
-                    free = free[free != j]  # remove full ingredien
+        # extra start from the best recipe of previous solves on this structure
+        elite = self._elite_start()
+        starts_alpha = [elite] if elite is not None else []
 
-            alpha, val = self.greedy(start_alpha=alpha0, allow_mass_moves=allow_mass_moves)
+        for i in range(len(starts_alpha) + n_starts):
+            alpha0 = starts_alpha[i] if i < len(starts_alpha) else start_fn()
+            alpha, val = search(start_alpha=alpha0, allow_mass_moves=allow_mass_moves)
             if val > best_val:
                 best_val = val
                 best_alpha = alpha
 
+        if best_alpha is not None:
+            self._remember(best_alpha[self.free_idx])
         return best_alpha, best_val
 
+    # ------------- start generators (reduced alpha) -------------
+
+    def _random_start(self) -> np.ndarray:
+        alpha0 = np.zeros(self.n_freeingr, dtype=int)
+        remaining = np.random.randint(1, self.sum_ingredients + 1)
+
+        # avoid infinite loops if all UBs reached
+
+        free = np.where(self.alpha_UB - alpha0 > 0)[0]
+        while remaining > 0 and free.size > 0:
+            j = np.random.choice(free)
+            cap = self.alpha_UB[j] - alpha0[j]
+            add = np.random.randint(1, min(remaining, cap) + 1)
+            alpha0[j] += add
+            remaining -= add
+            if alpha0[j] >= self.alpha_UB[j]:
+                free = free[free != j]  # remove full ingredien
+        return alpha0
+
+    def _relaxation_start(self, spread: float = 2.0) -> np.ndarray:
+        """
+        Randomized rounding of the relaxed optimum: jitter each coordinate by
+        N(0, spread), then round up with probability equal to its fractional part.
+        """
+        if self._relaxed is None:
+            self._relaxed = self.relaxed_optimum()
+        x = self._relaxed + np.random.normal(0.0, spread, self.n_freeingr)
+        x = np.clip(x, 0.0, self.alpha_UB)
+        alpha0 = np.floor(x + np.random.random(self.n_freeingr)).astype(int)
+        return np.minimum(alpha0, self.alpha_UB)  # greedy trims the total
+
+    # ------------- continuous relaxation -------------
+
+    def relaxed_optimum(self, n_iter: int = 200, step: float = 2.0) -> np.ndarray:
+        """
+        Maximize the objective over the continuous set
+        {0 <= alpha <= alpha_UB, sum(alpha) <= sum_ingredients} by projected
+        gradient ascent with a decreasing, gradient-normalized step.
+        Returns the best reduced (float) alpha found.
+        """
+        x = self._project(np.full(self.n_freeingr, self.sum_ingredients / self.n_freeingr))
+        best_x, best_val = x, self._objective_from_SvSb(self.V @ x, self.B @ x, x.sum())
+
+        for it in range(n_iter):
+            grad = self._relaxed_gradient(x)
+            norm = np.linalg.norm(grad)
+            if norm <= 1e-12:
+                break
+            x = self._project(x + step / np.sqrt(it + 1) * grad / norm)
+            val = self._objective_from_SvSb(self.V @ x, self.B @ x, x.sum())
+            if val > best_val:
+                best_x, best_val = x, val
+
+        return best_x
+
+    def _relaxed_gradient(self, x: np.ndarray) -> np.ndarray:
+        """Gradient of the (capped) objective at a continuous reduced alpha."""
+        total = x.sum()
+        if total <= 0:
+            return np.ones_like(x)
+        Sv = self.V @ x
+        Sb = self.B @ x
+        growth = (Sv > 0) * 1.1**Sb
+        E = np.maximum(Sv, 0.0) * growth
+        E_sum = E.sum()
+        if E_sum <= 0:
+            # no active effect yet: push towards increasing Sv
+            return self.w @ self.V
+
+        # dE[i, j] = dE_i / dalpha_j
+        dE = growth[:, None] * (self.V + (Sv * np.log(1.1))[:, None] * self.B)
+        probs = 20.0 * E / E_sum * np.sqrt(total)
+        c = self.w * (probs < self.prob_UB)  # capped effects have zero gradient
+        cE = c @ E
+        return 20.0 * np.sqrt(total) / E_sum * (c @ dE - cE / E_sum * dE.sum(axis=0)) + (
+            10.0 * cE / (E_sum * np.sqrt(total))
+        )
+
+    def _project(self, x: np.ndarray) -> np.ndarray:
+        """Euclidean projection onto {0 <= x <= alpha_UB, sum(x) <= sum_ingredients}."""
+        y = np.clip(x, 0.0, self.alpha_UB)
+        if y.sum() <= self.sum_ingredients:
+            return y
+        # g(tau) = sum(clip(x - tau, 0, UB)) is piecewise linear and decreasing, with
+        # breakpoints at x and x - UB: evaluate it there and interpolate g(tau) == 25
+        bps = np.sort(np.concatenate([x, x - self.alpha_UB]))
+        g = np.clip(x[None, :] - bps[:, None], 0.0, self.alpha_UB).sum(axis=1)
+        i = int(np.searchsorted(-g, -self.sum_ingredients))
+        if i == 0:
+            tau = bps[0]
+        else:
+            tau = bps[i - 1] + (g[i - 1] - self.sum_ingredients) * (bps[i] - bps[i - 1]) / (
+                g[i - 1] - g[i]
+            )
+        return np.clip(x - tau, 0.0, self.alpha_UB)
+
+    # ------------- parametric weight sweep -------------
+
+    def sweep(
+        self,
+        weight_grid: np.ndarray,
+        params: np.ndarray | None = None,
+        n_starts: int = 5,
+        allow_mass_moves: bool = True,
+    ) -> list[dict]:
+        """
+        Solve a sequence of weight vectors (rows of weight_grid) in one pass.
+
+        Each grid point is warm-started from the best recipe found so far under its
+        weights; only n_starts extra random starts are run per point. Consecutive
+        points with the same optimum are merged into one segment, and the breakpoint
+        between two segments is placed where their scores cross (linear interpolation
+        of the weights between grid points).
+
+        Returns a list of segments {"start", "end", "alpha", "probabilities"},
+        where start/end are values of params (defaults to the grid index).
+        """
+        weight_grid = np.atleast_2d(np.asarray(weight_grid, dtype=float))
+        assert weight_grid.shape[1] == self.n_dipl, "weight_grid columns != n_dipl"
+        n_points = weight_grid.shape[0]
+        if params is None:
+            params = np.arange(n_points, dtype=float)
+        params = np.asarray(params, dtype=float)
+        assert params.shape == (n_points,), "len(params) != number of grid points"
+
+        w_saved = self.w
+        cand_keys: list[tuple[int, ...]] = []  # distinct optima (reduced alpha)
+        cand_probs: list[np.ndarray] = []  # their capped probabilities
+        point_w = np.empty((n_points, self.n_dipl), dtype=float)
+
+        try:
+            for p, weights in enumerate(weight_grid):
+                self.set_weights(weights)
+                point_w[p] = self.w
+
+                # warm start: best known optimum re-scored under the new weights
+                start = None
+                if cand_keys:
+                    start = np.array(cand_keys[int(np.argmax(np.array(cand_probs) @ self.w))])
+                alpha, val = self.greedy(start_alpha=start, allow_mass_moves=allow_mass_moves)
+                if n_starts > 0:
+                    alpha_ms, val_ms = self.multistart(n_starts, allow_mass_moves)
+                    if val_ms > val + 1e-12:
+                        alpha = alpha_ms
+
+                key = self._key(alpha[self.free_idx])
+                if key not in cand_keys:
+                    cand_keys.append(key)
+                    probs = self._effect_probabilities(np.array(key, dtype=float))
+                    cand_probs.append(np.minimum(probs, self.prob_UB))
+        finally:
+            self.set_weights(w_saved)
+
+        # each point takes the best of all candidates: optima found at later points
+        # may beat the one solved at an earlier point
+        point_cand = np.argmax(np.array(cand_probs) @ point_w.T, axis=0)
+
+        # ---- merge equal optima into segments and locate the breakpoints ----
+        segments = []
+        seg_start = params[0]
+        for p in range(n_points):
+            c = point_cand[p]
+            if p + 1 < n_points and point_cand[p + 1] == c:
+                continue
+
+            end = params[p]
+            if p + 1 < n_points:
+                # the score difference (current - next) is linear in the raw weights,
+                # which are linear in params; normalizing only rescales it by a positive
+                # factor, so the sign change (f0 >= 0 >= f1) is at the same place
+                diff = cand_probs[c] - cand_probs[point_cand[p + 1]]
+                f0 = float(diff @ weight_grid[p])
+                f1 = float(diff @ weight_grid[p + 1])
+                s = f0 / (f0 - f1) if f0 > f1 else 0.0
+                end = params[p] + s * (params[p + 1] - params[p])
+
+            alpha_full = np.zeros(self.n_ingredients, dtype=int)
+            alpha_full[self.free_idx] = cand_keys[c]
+            segments.append(
+                {
+                    "start": float(seg_start),
+                    "end": float(end),
+                    "alpha": alpha_full,
+                    "probabilities": self.effect_probabilities(alpha_full),
+                }
+            )
+            seg_start = end
+
+        return segments
+
+    def sweep_effect(
+        self,
+        effect: int,
+        base_weights: np.ndarray | None = None,
+        n_points: int = 21,
+        n_starts: int = 5,
+        allow_mass_moves: bool = True,
+    ) -> list[dict]:
+        """
+        Sweep the weight of one effect from 0 to 1, keeping the other weights fixed.
+        """
+        assert 0 <= effect < self.n_dipl, "effect out of range"
+        if base_weights is None:
+            base_weights = self.w
+        t = np.linspace(0.0, 1.0, n_points)
+        weight_grid = np.tile(np.asarray(base_weights, dtype=float), (n_points, 1))
+        weight_grid[:, effect] = t
+        return self.sweep(
+            weight_grid, params=t, n_starts=n_starts, allow_mass_moves=allow_mass_moves
+        )
+
+    def frontier(
+        self,
+        n_weights: int = 64,
+        n_starts: int = 3,
+        time_budget: float = 1.0,
+        patience: int = 32,
+        seed: int | None = None,
+        allow_mass_moves: bool = True,
+        engine: str = "greedy",
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Candidate optima over weight vectors, for re-ranking without solving: the
+        score of a recipe is linear in the weights (capped probs @ w), so the best
+        candidate for any weights is an argmax of one matrix-vector product.
+
+        Solves each single-effect weight vector, then random sparse ones (2-4 effects,
+        as the sliders are used), each warm-started from the best candidate so far as
+        in sweep(), until n_weights are solved, `patience` random ones in a row add no
+        new recipe, or time_budget (seconds) runs out. The elite recipes of this
+        structure are candidates too. Candidates whose capped probabilities are
+        dominated by another candidate's are dropped.
+
+        Returns (alphas, probs): full-length alphas (m, n_ingredients) and their
+        capped probabilities (m, n_dipl).
+        """
+        if engine not in self.engines:
+            raise ValueError(f"unknown search engine: {engine}")
+        search = getattr(self, engine)
+        rng = np.random.default_rng(seed)
+        deadline = time.perf_counter() + time_budget
+        w_saved = self.w
+        cands: dict[tuple[int, ...], np.ndarray] = dict(self._elite_items())  # alpha -> probs
+        stall = 0
+
+        try:
+            for p in range(max(n_weights, 1)):
+                if p > 0 and (time.perf_counter() >= deadline or stall >= patience):
+                    break
+                weights = np.zeros(self.n_dipl)
+                if p < self.n_dipl:
+                    weights[p] = 1.0
+                else:
+                    k = min(int(rng.integers(2, 5)), self.n_dipl)
+                    weights[rng.choice(self.n_dipl, size=k, replace=False)] = rng.random(k)
+                self.set_weights(weights)
+
+                start = None
+                if cands:
+                    keys = list(cands)
+                    start = np.array(keys[int(np.argmax(np.array(list(cands.values())) @ self.w))])
+                alpha, val = search(start_alpha=start, allow_mass_moves=allow_mass_moves)
+                if n_starts > 0:
+                    alpha_ms, val_ms = self.multistart(n_starts, allow_mass_moves, engine=engine)
+                    if val_ms > val + 1e-12:
+                        alpha = alpha_ms
+
+                key = self._key(alpha[self.free_idx])
+                if key in cands:
+                    stall += p >= self.n_dipl
+                else:
+                    stall = 0
+                    probs = self._effect_probabilities(np.array(key, dtype=float))
+                    cands[key] = np.minimum(probs, self.prob_UB)
+        finally:
+            self.set_weights(w_saved)
+
+        keys = list(cands)
+        probs = np.array(list(cands.values()))
+        # drop dominated candidates (never strictly better for any non-negative weights)
+        ge = (probs[:, None, :] >= probs[None, :, :]).all(axis=2)
+        gt = (probs[:, None, :] > probs[None, :, :]).any(axis=2)
+        dominated = (ge & gt).any(axis=0)
+        keep = np.nonzero(~dominated)[0]
+
+        alphas = np.zeros((len(keep), self.n_ingredients), dtype=int)
+        alphas[:, self.free_idx] = np.array([keys[i] for i in keep], dtype=int)
+        return alphas, probs[keep]
+
     def effect_probabilities(self, alpha_full: np.ndarray) -> np.ndarray:
         """
         Compute effect probabilities given full-length alpha (length n_ingredients)
@@ -186,16 +701,52 @@ class CauldronOptimizer:
         alpha = alpha_full[self.free_idx]
         return self._effect_probabilities(alpha)
 
+    def effect_probabilities_batch(self, alphas_full: np.ndarray) -> np.ndarray:
+        """
+        Vectorized effect_probabilities for a (n_recipes, n_ingredients) matrix of
+        full-length alphas. Returns a (n_recipes, n_dipl) matrix.
+        """
+        alphas = np.asarray(alphas_full, dtype=float)[:, self.free_idx]
+        Sv = alphas @ self.V.T
+        Sb = alphas @ self.B.T
+        E = np.maximum(Sv, 0.0) * (1.1**Sb)
+        E_sum = E.sum(axis=1, keepdims=True)
+        total = alphas.sum(axis=1, keepdims=True)
+
+        valid = (E_sum > 0) & (total > 0)
+        probs = np.zeros_like(E)
+        np.divide(20.0 * E * np.sqrt(np.maximum(total, 0.0)), E_sum, out=probs, where=valid)
+        return probs
+
     # ------------------ caching helpers ------------------
 
     def _key(self, alpha: np.ndarray) -> tuple[int, ...]:
         # alpha is reduced-length already; ensure int key
         return tuple(alpha.tolist())
 
-    def _cache_put(self, key: tuple[int, ...], val: float) -> None:
-        self._obj_cache[key] = val
-        if len(self._obj_cache) > self._cache_max_size:
-            self._obj_cache.clear()
+    def _remember(self, alpha: np.ndarray) -> None:
+        """Add a reduced alpha to the elite set, dropping the oldest when full."""
+        key = self._key(alpha)
+        probs = np.minimum(self._effect_probabilities(alpha.astype(float)), self.prob_UB)
+        with self._elite_lock:
+            if key in self._elite:
+                return
+            self._elite[key] = probs
+            if len(self._elite) > self._elite_max_size:
+                self._elite.pop(next(iter(self._elite)))
+
+    def _elite_items(self) -> tuple[tuple[tuple[int, ...], np.ndarray], ...]:
+        """Snapshot of the elite set, safe to iterate while other threads add to it."""
+        with self._elite_lock:
+            return tuple(self._elite.items())
+
+    def _elite_start(self) -> np.ndarray | None:
+        """Best elite recipe under the current weights (reduced alpha), if any."""
+        elite = self._elite_items()
+        if not elite:
+            return None
+        scores = np.array([probs for _, probs in elite]) @ self.w
+        return np.array(elite[int(np.argmax(scores))][0], dtype=int)
 
     # ------------- core computations -------------
 
@@ -232,29 +783,18 @@ class CauldronOptimizer:
         probs = np.minimum(probs, self.prob_UB)
         return probs @ self.w
 
-    def _objective_fast(self, alpha: np.ndarray) -> float:
-        probs = self.effect_probabilities(alpha)
-        probs = np.minimum(probs, self.prob_UB)
+    def _objective_from_SvSb_batch(
+        self, Sv: np.ndarray, Sb: np.ndarray, total: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized _objective_from_SvSb for m candidates:
+        Sv, Sb of shape (m, n_dipl), total of shape (m,).
+        """
+        E = np.maximum(Sv, 0.0) * (1.1**Sb)
+        E_sum = E.sum(axis=1)
+        valid = (E_sum > 0) & (total > 0)
+        scale = np.zeros_like(E_sum)
+        np.divide(20.0 * np.sqrt(np.maximum(total, 0)), E_sum, out=scale, where=valid)
+        probs = np.minimum(E * scale[:, None], self.prob_UB)
         return probs @ self.w
 
-    def _objective(self, alpha: np.ndarray) -> float:
-        key = self._key(alpha)
-        cached = self._obj_cache.get(key)
-        if cached is not None:
-            return cached
-
-        s = alpha.sum()
-        # feasibility checks
-        if (alpha < 0).any() or (alpha > self.alpha_UB + 1e-9).any() or s > self.sum_ingredients:
-            val = -1e12
-            self._cache_put(key, val)
-            return val
-
-        if s == 0:
-            val = 0.0
-            self._cache_put(key, val)
-            return val
-
-        val = self._objective_fast(alpha)
-        self._cache_put(key, val)
-        return val
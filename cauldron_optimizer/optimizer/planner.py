@@ -0,0 +1,206 @@
+import time
+
+import numpy as np
+
+from cauldron_optimizer.optimizer.optimizer import CauldronOptimizer
+
+
+def plan_brews(
+    opt: CauldronOptimizer,
+    inventory: np.ndarray,
+    n_brews: int,
+    n_starts: int = 5,
+    time_budget: float = 2.0,
+    max_solves: int | None = None,
+    beam_width: int = 64,
+    starts: str = "relaxation",
+    engine: str = "greedy",
+) -> dict:
+    """
+    Plan up to n_brews brews from a finite stock of ingredients, maximizing the total
+    score (sum of the per-brew objectives under opt's weights).
+
+    inventory is the per-ingredient stock (full length, n_ingredients); premium
+    ingredients of opt are never used.
+
+    Candidate recipes are per-brew optima over a lattice of remaining inventory: for
+    a stock R shared by k brews, the optimum with bounds min(R // j, 25) for
+    j = k, 1, 2, ..., k - 1 (one solve per distinct bound vector). The candidates are
+    combined by a dynamic program over the remaining inventory (beam_width states per
+    brew, see _combine). The stock left by the best plan, alone and together with
+    each recipe group of the plan, seeds the next lattice round, until no new bounds
+    appear, time_budget (seconds) is spent or max_solves solves are run. At least
+    one solve is always run.
+
+    Returns a dict with:
+    brews       -- [{"alpha", "count", "probabilities", "value"}], best recipe first
+    value       -- total score of the plan
+    n_brews     -- number of brews planned (<= n_brews if the stock runs out)
+    remaining   -- (n_ingredients,) stock left after the plan
+    n_solves    -- number of per-brew optimizations run
+    complete    -- False if time_budget or max_solves ran out before the lattice was
+                   exhausted
+    """
+    inventory = np.maximum(np.asarray(inventory, dtype=int), 0)
+    assert inventory.shape == (opt.n_ingredients,), "len(inventory) != n_ingredients"
+    n_brews = int(n_brews)
+    deadline = time.perf_counter() + time_budget
+
+    pool: dict[tuple[int, ...], float] = {}  # candidate recipe (full alpha) -> score
+    solved: set[tuple[int, ...]] = set()  # bound vectors already optimized
+    optima: list[tuple[np.ndarray, np.ndarray]] = []  # (bounds, optimum) of each solve
+    queue = list(_lattice(inventory, n_brews, opt.sum_ingredients))
+    n_solves = 0
+    complete = True
+    plan = _combine(pool, inventory, n_brews, beam_width)
+    combine_time = 0.0  # the last combine runs after the loop: keep time for it
+
+    while queue:
+        for ub in queue:
+            key = tuple(ub.tolist())
+            if key in solved:
+                continue
+            solved.add(key)
+            # an optimum under looser bounds that still fits is also optimal here
+            if any((a <= ub).all() and (ub <= u).all() for u, a in optima):
+                continue
+            out_of_solves = max_solves is not None and n_solves >= max_solves
+            if n_solves > 0 and (
+                out_of_solves or time.perf_counter() + combine_time >= deadline
+            ):
+                complete = False
+                break
+            alpha, val = opt.with_bounds(ub).multistart(n_starts, starts=starts, engine=engine)
+            n_solves += 1
+            if alpha is not None and alpha.sum() > 0:
+                optima.append((ub, alpha))
+                pool[tuple(alpha.tolist())] = float(val)
+        t0 = time.perf_counter()
+        plan = _combine(pool, inventory, n_brews, beam_width)
+        combine_time = time.perf_counter() - t0
+        if not complete:
+            break
+
+        # next round: re-split the leftovers, alone and with each recipe group returned
+        queue = []
+        brews_left = n_brews - sum(count for _, count in plan["groups"])
+        for alpha, count in [(None, 0), *plan["groups"]]:
+            remaining = plan["remaining"] + (count * np.array(alpha) if count else 0)
+            for ub in _lattice(remaining, brews_left + count, opt.sum_ingredients):
+                if tuple(ub.tolist()) not in solved:
+                    queue.append(ub)
+
+    brews = []
+    for alpha, count in plan["groups"]:
+        alpha_full = np.array(alpha, dtype=int)
+        brews.append(
+            {
+                "alpha": alpha_full,
+                "count": count,
+                "probabilities": opt.effect_probabilities(alpha_full),
+                "value": pool[alpha],
+            }
+        )
+    brews.sort(key=lambda b: -b["value"])
+
+    return {
+        "brews": brews,
+        "value": plan["value"],
+        "n_brews": sum(b["count"] for b in brews),
+        "remaining": plan["remaining"],
+        "n_solves": n_solves,
+        "complete": complete,
+    }
+
+
+def _lattice(remaining: np.ndarray, brews_left: int, cap: int):
+    """Distinct per-brew bounds for sharing `remaining` among j = k, 1, ..., k-1 brews."""
+    seen = set()
+    if brews_left <= 0:
+        return
+    for j in [brews_left, *range(1, brews_left)]:
+        ub = np.minimum(remaining // j, cap)
+        key = tuple(ub.tolist())
+        if key not in seen and ub.any():
+            seen.add(key)
+            yield ub
+
+
+def _combine(
+    pool: dict[tuple[int, ...], float],
+    inventory: np.ndarray,
+    n_brews: int,
+    beam_width: int,
+) -> dict:
+    """
+    Choose how many brews of each candidate recipe to make: a DP over brews whose
+    states are (remaining inventory, last recipe used). Recipes are added in
+    non-increasing score order so each multiset is built once; states reaching the
+    same remaining inventory with the same last recipe are merged (best score kept),
+    and only the beam_width states with the best score plus completion estimate
+    (the best single recipe repeated as often as the stock and brews allow) survive
+    each brew.
+
+    Returns {"groups": [(alpha key, count)], "value", "remaining"}.
+    """
+    keys = sorted(pool, key=lambda k: -pool[k])
+    if not keys or n_brews <= 0:
+        return {"groups": [], "value": 0.0, "remaining": inventory.copy()}
+    alphas = np.array(keys, dtype=int)
+    values = np.array([pool[k] for k in keys])
+    n_cand = len(keys)
+
+    rem = inventory[None, :]
+    val = np.zeros(1)
+    last = np.zeros(1, dtype=int)
+    history = []  # per brew: (parent state, recipe) of each surviving state
+    best = (0.0, -1, 0)  # (value, brew, state)
+
+    for b in range(n_brews):
+        fits = (alphas[None, :, :] <= rem[:, None, :]).all(axis=2)
+        fits &= np.arange(n_cand)[None, :] >= last[:, None]
+        s_idx, c_idx = np.nonzero(fits)
+        if s_idx.size == 0:
+            break
+
+        new_val = val[s_idx] + values[c_idx]
+        new_rem = rem[s_idx] - alphas[c_idx]
+        rank = new_val + _completion(new_rem, c_idx, alphas, values, n_brews - b - 1)
+        order = np.argsort(-rank, kind="stable")
+        s_idx, c_idx, new_val, new_rem = s_idx[order], c_idx[order], new_val[order], new_rem[order]
+
+        # DP merge on (remaining, last): the first occurrence ranks best
+        _, first = np.unique(np.column_stack([new_rem, c_idx]), axis=0, return_index=True)
+        keep = np.sort(first)[:beam_width]
+
+        rem, val, last = new_rem[keep], new_val[keep], c_idx[keep]
+        history.append((s_idx[keep], c_idx[keep]))
+        top = int(np.argmax(val))
+        if val[top] > best[0]:
+            best = (float(val[top]), b, top)
+
+    value, b, s = best
+    counts = np.zeros(n_cand, dtype=int)
+    remaining = inventory.copy()
+    while b >= 0:
+        parent, recipe = history[b]
+        counts[recipe[s]] += 1
+        remaining -= alphas[recipe[s]]
+        s = parent[s]
+        b -= 1
+
+    groups = [(keys[c], int(counts[c])) for c in np.nonzero(counts)[0]]
+    return {"groups": groups, "value": value, "remaining": remaining}
+
+
+def _completion(
+    rem: np.ndarray, last: np.ndarray, alphas: np.ndarray, values: np.ndarray, brews_left: int
+) -> np.ndarray:
+    """Score of the best single recipe (index >= last) repeated as often as it fits."""
+    if brews_left <= 0:
+        return np.zeros(len(rem))
+    with np.errstate(divide="ignore"):
+        copies = np.where(alphas[None, :, :] > 0, rem[:, None, :] // alphas[None, :, :], brews_left)
+    copies = np.minimum(copies.min(axis=2), brews_left)
+    copies[np.arange(len(values))[None, :] < last[:, None]] = 0
+    return (copies * values[None, :]).max(axis=1)
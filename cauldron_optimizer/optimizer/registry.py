@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from cauldron_optimizer.optimizer.optimizer import CauldronOptimizer
+
+
+class OptimizerRegistry:
+    """
+    LRU registry of warm CauldronOptimizer instances keyed by problem structure
+    (n_dipl, premium set, alpha_UB, prob_UB).
+
+    get() returns a per-call copy carrying the requested weights; it shares the
+    cached instance's V/B slices, bounds and elite recipes, so concurrent requests
+    never see each other's weights.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = int(max_size)
+        self._instances: OrderedDict[tuple, CauldronOptimizer] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        effect_weights: np.ndarray,
+        premium_ingr: list[int] = [],
+        alpha_UB: int | None = None,
+        prob_UB: int = 100,
+    ) -> CauldronOptimizer:
+        if alpha_UB is None:
+            alpha_UB = CauldronOptimizer.sum_ingredients
+        premium = tuple(sorted(set(premium_ingr)))
+        key = (len(effect_weights), premium, int(alpha_UB), int(prob_UB))
+
+        with self._lock:
+            base = self._instances.get(key)
+            if base is not None:
+                self._instances.move_to_end(key)
+                self.hits += 1
+        if base is None:
+            # build outside the lock; a concurrent duplicate is harmless
+            base = CauldronOptimizer(
+                effect_weights=effect_weights,
+                premium_ingr=list(premium),
+                alpha_UB=alpha_UB,
+                prob_UB=prob_UB,
+            )
+            with self._lock:
+                base = self._instances.setdefault(key, base)
+                self._instances.move_to_end(key)
+                self.misses += 1
+                while len(self._instances) > self.max_size:
+                    self._instances.popitem(last=False)
+
+        return base.with_weights(effect_weights)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instances.clear()
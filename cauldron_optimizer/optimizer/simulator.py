@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+PROBE_SIZE = 1_000  # simulations of the first batch, timed to size the others
+
+
+def simulate_brews(
+    probabilities: np.ndarray,
+    n_brews: int,
+    n_sims: int = 1_000_000,
+    time_budget: float = 0.2,
+    batch_size: int = 50_000,
+    seed: int | None = None,
+) -> dict:
+    """
+    Monte Carlo simulation of n_brews brews of a fixed recipe.
+
+    probabilities are the effect probabilities in percent, as returned by
+    CauldronOptimizer.effect_probabilities; the remaining mass is "no effect".
+    Each simulation draws the per-effect counts of n_brews brews from a multinomial,
+    until n_sims are drawn or time_budget (seconds) is spent. A simulation costs
+    about n_brews x n_effects, so a first PROBE_SIZE batch is timed and every
+    later batch (at most batch_size) is sized to end before the deadline. At least
+    the first batch is always drawn.
+
+    Returns a dict with:
+    n_sims   -- number of simulations actually drawn
+    hist     -- (n_effects, n_brews + 1) distribution of the count of each effect
+    at_least -- (n_effects, n_brews + 1), at_least[i, m] = P(effect i >= m times)
+    mean     -- (n_effects,) expected count of each effect
+    quantiles -- {q: (n_effects,) count quantiles} for q in QUANTILES
+    """
+    p = np.clip(np.asarray(probabilities, dtype=float) / 100.0, 0.0, None)
+    if p.sum() > 1.0:
+        p = p / p.sum()
+    pvals = np.append(p, max(0.0, 1.0 - p.sum()))  # last entry: no effect
+    n_effects = len(p)
+    n_brews = int(n_brews)
+    rng = np.random.default_rng(seed)
+
+    # flat bincount over (effect, count) pairs
+    offsets = np.arange(n_effects) * (n_brews + 1)
+    counts_hist = np.zeros(n_effects * (n_brews + 1), dtype=np.int64)
+
+    start = time.perf_counter()
+    deadline = start + time_budget
+    drawn = 0
+    size = min(PROBE_SIZE, batch_size, n_sims)
+    while size > 0:
+        counts = rng.multinomial(n_brews, pvals, size=size)[:, :n_effects]
+        counts_hist += np.bincount(
+            (counts + offsets).ravel(), minlength=counts_hist.size
+        )
+        drawn += size
+        now = time.perf_counter()
+        per_sim = (now - start) / drawn
+        size = min(batch_size, n_sims - drawn, int((deadline - now) / per_sim))
+
+    hist = counts_hist.reshape(n_effects, n_brews + 1) / drawn
+    cdf = np.cumsum(hist, axis=1)
+    at_least = np.concatenate([np.ones((n_effects, 1)), 1.0 - cdf[:, :-1]], axis=1)
+    mean = hist @ np.arange(n_brews + 1)
+    quantiles = {q: np.argmax(cdf >= q - 1e-12, axis=1) for q in QUANTILES}
+
+    return {
+        "n_sims": drawn,
+        "hist": hist,
+        "at_least": np.clip(at_least, 0.0, 1.0),
+        "mean": mean,
+        "quantiles": quantiles,
+    }
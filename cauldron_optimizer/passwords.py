@@ -0,0 +1,50 @@
+"""Password hashing with a configurable policy, offloaded to a bounded worker pool.
+
+The KDF is deliberately expensive, so at most `workers` hashes run at once and at
+most `queue` more may wait; anything beyond that fails fast with HashingBusy
+instead of taking CPU from the optimizer.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from cauldron_optimizer.config import get_password_hash_settings
+
+_settings = get_password_hash_settings()
+_executor = ThreadPoolExecutor(max_workers=_settings["workers"], thread_name_prefix="pwhash")
+_slots = threading.BoundedSemaphore(_settings["workers"] + _settings["queue"])
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool is saturated."""
+
+
+def _run(fn, *args):
+    if not _slots.acquire(timeout=_settings["timeout"]):
+        raise HashingBusy()
+    try:
+        return _executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(plaintext: str) -> str:
+    return _run(generate_password_hash, plaintext, _settings["method"])
+
+
+def verify_password(pwhash: str, plaintext: str) -> bool:
+    return _run(check_password_hash, pwhash, plaintext)
+
+
+@cache
+def _policy_prefix() -> str:
+    # werkzeug fills in default parameters (e.g. iterations), so read them back
+    return generate_password_hash("", _settings["method"]).split("$", 1)[0]
+
+
+def needs_rehash(pwhash: str) -> bool:
+    """Whether a stored hash was made with a different policy than the current one."""
+    return pwhash.split("$", 1)[0] != _policy_prefix()
@@ -0,0 +1,35 @@
+"""Preloaded multi-worker serving (gunicorn.conf.py at the repository root):
+
+    gunicorn            # WEB_CONCURRENCY workers, api.index:app
+
+The master imports the app once, warm() fills the caches every worker would
+otherwise build on its first requests, and the workers are forked afterwards:
+they share the interpreter, libraries, compiled templates, catalogs and the V/B
+matrices (read-only, see optimizer.py) copy-on-write instead of loading private
+copies. after_fork() then drops what must not be shared between processes.
+"""
+
+import numpy as np
+
+from cauldron_optimizer import app, helpers, passwords, solver
+from cauldron_optimizer.constants import LANGUAGES, PRELOAD_FRONTIERS, SEARCH_ENGINE
+from cauldron_optimizer.database import engine
+
+
+def warm() -> None:
+    """Build the per-process caches in the master, before workers are forked."""
+    for name in app.jinja_env.list_templates(extensions=["html"]):
+        app.jinja_env.get_template(name)
+    for lang in LANGUAGES:
+        with app.test_request_context(f"/?lang={lang}"):
+            helpers.translated_names()
+    passwords.needs_rehash("")  # policy prefix: one full hash
+    for structure in PRELOAD_FRONTIERS:
+        solver.frontier(*structure, SEARCH_ENGINE)
+    solver.shutdown()  # workers start their own solver pool if configured
+
+
+def after_fork() -> None:
+    """Per-worker state: DB connections and the optimizer's random stream."""
+    engine.dispose(close=False)  # the master's connections stay with the master
+    np.random.seed()  # or every worker would draw the same random starts
@@ -0,0 +1,185 @@
+"""Opt-in per-request profiling.
+
+A request is profiled when it carries an `X-Profile-Token` header equal to
+PROFILE_TOKEN, or when it is picked by PROFILE_SAMPLE_RATE. The WSGI call is
+then wrapped in cProfile plus a stack sampler, and each capture is stored in
+PROFILE_DIR as:
+    <name>.prof       cProfile stats (pstats / snakeviz)
+    <name>.collapsed  sampled stacks, one "f1;f2;f3 count" per line (flamegraph.pl,
+                      speedscope)
+    <name>.json       summary: route, duration, time in the optimizer, DB, render
+When neither trigger is configured the middleware is not installed at all.
+"""
+
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from cauldron_optimizer.config import get_profiling_settings
+
+# summary buckets: (label, predicate on (filename, function name))
+SUMMARY_BUCKETS = (
+    ("search", lambda f, n: n in ("greedy", "annealing", "tabu") and "optimizer" in f),
+    ("objective", lambda f, n: n.startswith("_objective_from_SvSb")),
+    ("db", lambda f, n: n in ("execute", "_execute_context") and "sqlalchemy" in f),
+    ("render", lambda f, n: n == "render_template"),
+)
+
+
+def _outermost_time(stats: dict, match) -> float:
+    """
+    Cumulative time of the functions matching a bucket, counting only calls made
+    from outside any matching frame (e.g. annealing's greedy polish is already in
+    annealing's time, Connection.execute in Session.execute's).
+    """
+    inside: dict[tuple, bool] = {}  # function -> runs in (or is) a matching frame
+
+    def is_inside(func) -> bool:
+        if func not in inside:
+            inside[func] = False  # recursion guard
+            inside[func] = match(func[0], func[2]) or any(
+                is_inside(caller) for caller in stats[func][4] if caller in stats
+            )
+        return inside[func]
+
+    total = 0.0
+    for func, (_, _, _, cumtime, callers) in stats.items():
+        if not match(func[0], func[2]):
+            continue
+        if not callers:
+            total += cumtime
+        for caller, (_, _, _, caller_cumtime) in callers.items():
+            if caller not in stats or not is_inside(caller):
+                total += caller_cumtime
+    return total
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's stack every `interval` seconds into collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                names.append(f"{module}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class ProfilingMiddleware:
+    """WSGI middleware that profiles selected requests."""
+
+    def __init__(self, wsgi_app, settings: dict):
+        self.wsgi_app = wsgi_app
+        self.token = settings["token"]
+        self.sample_rate = settings["sample_rate"]
+        self.dir = settings["dir"]
+        self.keep = settings["keep"]
+
+    def wanted(self, environ) -> bool:
+        header = environ.get("HTTP_X_PROFILE_TOKEN")
+        if self.token and header and hmac.compare_digest(header, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, environ, start_response):
+        if not self.wanted(environ):
+            return self.wsgi_app(environ, start_response)
+
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        t0 = time.perf_counter()
+        profiler.enable()
+        try:
+            # consume the body inside the profile so rendering/streaming is included
+            iterable = self.wsgi_app(environ, start_response)
+            try:
+                body = list(iterable)
+            finally:
+                if hasattr(iterable, "close"):
+                    iterable.close()
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - t0
+            sampler.stop()
+            self.store(environ, profiler, sampler, duration)
+        return body
+
+    def store(self, environ, profiler, sampler, duration: float) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        route = environ.get("PATH_INFO", "/").strip("/").replace("/", "_") or "index"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**6:06d}-{route}"
+        base = os.path.join(self.dir, name)
+
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".collapsed", "w") as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        summary = {label: _outermost_time(stats.stats, match) for label, match in SUMMARY_BUCKETS}
+        with open(base + ".json", "w") as f:
+            json.dump(
+                {
+                    "name": name,
+                    "method": environ.get("REQUEST_METHOD"),
+                    "path": environ.get("PATH_INFO"),
+                    "duration_ms": 1000 * duration,
+                    **{f"{k}_ms": 1000 * v for k, v in summary.items()},
+                },
+                f,
+            )
+        self.prune()
+
+    def prune(self) -> None:
+        captures = sorted(f for f in os.listdir(self.dir) if f.endswith(".json"))
+        for old in captures[: max(0, len(captures) - self.keep)]:
+            for ext in (".json", ".prof", ".collapsed"):
+                try:
+                    os.remove(os.path.join(self.dir, old[: -len(".json")] + ext))
+                except OSError:
+                    pass
+
+
+def recent_captures(directory: str) -> list[dict]:
+    """Summaries of the stored captures, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    captures = []
+    for filename in sorted(os.listdir(directory), reverse=True):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename)) as f:
+                captures.append(json.load(f))
+    return captures
+
+
+def install(app) -> None:
+    """Wrap app.wsgi_app when profiling is configured; otherwise leave it untouched."""
+    settings = get_profiling_settings()
+    app.config["PROFILE_DIR"] = settings["dir"]
+    if settings["token"] or settings["sample_rate"] > 0:
+        app.wsgi_app = ProfilingMiddleware(app.wsgi_app, settings)
@@ -1,19 +1,56 @@
 import json
+from itertools import islice
 from typing import TYPE_CHECKING
 
 import numpy as np
-from flask import Response, redirect, render_template, request, session, url_for
+from flask import (
+    Response,
+    g,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    send_from_directory,
+    session,
+    stream_with_context,
+    url_for,
+)
 from flask_babel import gettext as _
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from cauldron_optimizer import app
-from cauldron_optimizer.constants import EFFECT_NAMES, INGREDIENT_NAMES, LANGUAGES
-from cauldron_optimizer.database import db_session
+from cauldron_optimizer import app, solver
+from cauldron_optimizer.admission import admission
+from cauldron_optimizer.constants import (
+    BULK_CHUNK_SIZE,
+    EFFECT_NAMES,
+    FRONTIER_STARTS,
+    FRONTIER_WEIGHTS,
+    LANGUAGES,
+    MAX_BREWS,
+    MAX_PLAN_BREWS,
+    N_INGREDIENTS,
+    PLAN_MAX_SOLVES,
+    PLAN_STARTS,
+    PLAN_TIME_BUDGET,
+    SEARCH_ENGINE,
+    SIMULATION_TIME_BUDGET,
+    START_METHOD,
+)
+from cauldron_optimizer.database import db_session, metrics
 from cauldron_optimizer.db_model import User, UserSettings
 from cauldron_optimizer.forms import LoginForm, RegisterForm, SearchForm
-from cauldron_optimizer.helpers import error, first_form_error, login_required
+from cauldron_optimizer.helpers import (
+    admin_required,
+    error,
+    first_form_error,
+    iter_recipe_rows,
+    login_required,
+)
 from cauldron_optimizer.optimizer.optimizer import CauldronOptimizer
+from cauldron_optimizer.optimizer.simulator import simulate_brews
+from cauldron_optimizer.profiling import recent_captures
+from cauldron_optimizer.solver import optimizers
 
 if TYPE_CHECKING:
     from flask import Response
@@ -45,9 +82,18 @@ def after_request(response: Response) -> Response:
     )
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "0"
+    if "db_checkout_ms" in g:
+        response.headers["Server-Timing"] = f"db-checkout;dur={g.db_checkout_ms:.2f}"
     return response
 
 
+@app.route("/metrics/db")
+@admin_required
+def db_metrics():
+    """Connection pool metrics: checkout latency, occupancy and reconnects."""
+    return jsonify(metrics.snapshot())
+
+
 # constants.py
 @app.route("/")
 @app.route("/home")
@@ -75,12 +121,7 @@ def index():
         form.effect_weights_json.data = json.dumps(settings.effect_weights)
         form.language.data = session.get("lang", "es")
 
-        return render_template(
-            "index.html",
-            form=form,
-            effect_names=EFFECT_NAMES,
-            ingredient_names=INGREDIENT_NAMES,
-        )
+        return render_template("index.html", form=form)
 
 
 @app.route("/login", methods=["GET", "POST"])
@@ -194,6 +235,9 @@ def optimize():
         n_starts = int(form.n_starts.data)
         premium_ingr = request.form.getlist("premium_ingredients[]", type=int)
         lang_choice = form.language.data
+        engine = request.form.get("engine", SEARCH_ENGINE)
+        if engine not in CauldronOptimizer.engines:
+            raise ValueError(_("Motor de búsqueda inválido"))
     except ValueError as e:
         return error(str(e), url=url_for("index"))
 
@@ -221,14 +265,19 @@ def optimize():
     session["lang"] = lang_choice
 
     # Run optimizer using the persisted settings
-    opt = CauldronOptimizer(
-        effect_weights=effect_weights,
-        premium_ingr=premium_ingr,
-        alpha_UB=alpha_ub,
-        prob_UB=prob_ub,
-    )
+    problem = {
+        "effect_weights": effect_weights,
+        "premium_ingr": premium_ingr,
+        "alpha_UB": alpha_ub,
+        "prob_UB": prob_ub,
+    }
+    opt = optimizers.get(**problem)
 
-    alpha_best, val_best = opt.multistart(n_starts)
+    # admission control may cap the number of starts under load
+    with admission.admit(user_id, n_starts, opt.n_freeingr, engine) as granted_starts:
+        alpha_best, val_best = solver.multistart(
+            problem, granted_starts, starts=START_METHOD, engine=engine
+        )
     alpha_matrix = alpha_best.reshape(3, 4).astype(int).tolist()
     score = float(val_best)
     out_effects = opt.effect_probabilities(alpha_best)
@@ -253,12 +302,40 @@ def optimize():
         "alpha_matrix": alpha_matrix,
         "effects": filtered_effects,
         "score": score,
+        "n_starts": n_starts,
+        "granted_starts": granted_starts,
     }
     session["premium_ingredients"] = premium_ingr
 
     return redirect(url_for("results"))
 
 
+# Weight-response frontier: candidate recipes re-ranked in the browser (optimizer.js)
+@app.route("/frontier")
+@login_required
+def frontier():
+    n_dipl = request.args.get("n_diploma", default=1, type=int)
+    n_dipl = max(1, min(n_dipl, len(EFFECT_NAMES)))
+    alpha_ub = request.args.get("alpha_UB", default=CauldronOptimizer.sum_ingredients, type=int)
+    alpha_ub = max(1, min(alpha_ub, CauldronOptimizer.sum_ingredients))
+    prob_ub = max(1, min(request.args.get("prob_UB", default=100, type=int), 100))
+    premium = tuple(
+        sorted({j for j in request.args.getlist("premium", type=int) if 0 <= j < N_INGREDIENTS})
+    )
+
+    structure = (n_dipl, premium, alpha_ub, prob_ub, SEARCH_ENGINE)
+    data = solver.cached_frontier(*structure)
+    if data is None:
+        # its own admission slot, so a search submitted meanwhile is not refused;
+        # a frontier is one search per start of every weight vector, all or nothing
+        n_free = N_INGREDIENTS - len(premium)
+        n_searches = FRONTIER_WEIGHTS * (1 + FRONTIER_STARTS)
+        user_id = ("frontier", session["user_id"])
+        with admission.admit(user_id, n_searches, n_free, SEARCH_ENGINE, partial=False):
+            data = solver.frontier(*structure)
+    return jsonify(data)
+
+
 @app.route("/results")
 @login_required
 def results():
@@ -267,11 +344,136 @@ def results():
     if not last_results:
         return redirect(url_for("index"))
 
+    # Optional Monte Carlo simulation of n brews: /results?n_brews=10&at_least=2
+    effects = last_results["effects"]
+    n_brews = request.args.get("n_brews", type=int)
+    at_least = request.args.get("at_least", default=1, type=int)
+    simulation = None
+    if n_brews is not None:
+        n_brews = max(1, min(n_brews, MAX_BREWS))
+        at_least = max(0, min(at_least, n_brews))
+        sim = simulate_brews(
+            [effect["value"] for effect in effects],
+            n_brews,
+            time_budget=SIMULATION_TIME_BUDGET,
+        )
+        simulation = {
+            "n_brews": n_brews,
+            "at_least": at_least,
+            "n_sims": sim["n_sims"],
+            "rows": [
+                {
+                    **effect,
+                    "prob_at_least": 100.0 * float(sim["at_least"][k, at_least]),
+                    "mean": float(sim["mean"][k]),
+                    "low": int(sim["quantiles"][0.05][k]),
+                    "high": int(sim["quantiles"][0.95][k]),
+                }
+                for k, effect in enumerate(effects)
+            ],
+        }
+
     return render_template(
         "results.html",
         alpha_matrix=last_results["alpha_matrix"],
-        effects=last_results["effects"],
+        effects=effects,
         score=last_results["score"],
+        capped_starts=(
+            last_results["granted_starts"]
+            if last_results.get("granted_starts", 0) < last_results.get("n_starts", 0)
+            else None
+        ),
+        simulation=simulation,
+        max_brews=MAX_BREWS,
+    )
+
+
+# Inventory planner: several brews from a finite stock, with the last search settings
+@app.route("/plan", methods=["GET", "POST"])
+@login_required
+def plan():
+    inventory = session.get("inventory", [0] * N_INGREDIENTS)
+    n_brews = session.get("plan_brews", 10)
+    result = None
+
+    if request.method == "POST":
+        try:
+            inventory = [
+                max(0, int(request.form.get(f"inv_{j}", 0))) for j in range(N_INGREDIENTS)
+            ]
+            n_brews = max(1, min(int(request.form.get("n_brews", n_brews)), MAX_PLAN_BREWS))
+        except ValueError as e:
+            return error(str(e), url=url_for("plan"))
+        session["inventory"] = inventory
+        session["plan_brews"] = n_brews
+
+        user_id = session["user_id"]
+        with db_session() as db_sa:
+            settings = db_sa.get(UserSettings, user_id)
+            if settings is None:
+                return error(
+                    _("No se encontró la configuracion del ususario"), url=url_for("index")
+                )
+            effect_weights = np.array(settings.effect_weights, dtype=np.float64)
+            alpha_ub = int(settings.max_ingredients)
+            prob_ub = int(settings.max_effects)
+
+        problem = {
+            "effect_weights": effect_weights,
+            "premium_ingr": session.get("premium_ingredients", []),
+            "alpha_UB": alpha_ub,
+            "prob_UB": prob_ub,
+        }
+        opt = optimizers.get(**problem)
+        # a plan runs up to PLAN_MAX_SOLVES multistarts: under pressure, fewer solves
+        with admission.admit(
+            user_id, PLAN_STARTS * PLAN_MAX_SOLVES, opt.n_freeingr, SEARCH_ENGINE
+        ) as granted_starts:
+            planned = solver.plan(
+                problem,
+                np.array(inventory),
+                n_brews,
+                n_starts=min(PLAN_STARTS, granted_starts),
+                time_budget=PLAN_TIME_BUDGET,
+                max_solves=max(1, granted_starts // PLAN_STARTS),
+                starts=START_METHOD,
+                engine=SEARCH_ENGINE,
+            )
+
+        brews = []
+        for brew in planned["brews"]:
+            probs = brew["probabilities"]
+            order = sorted(range(len(probs)), key=lambda i: (-probs[i], i))
+            brews.append(
+                {
+                    "count": brew["count"],
+                    "alpha_matrix": brew["alpha"].reshape(3, 4).tolist(),
+                    "score": brew["value"],
+                    "effects": [
+                        {
+                            "value": round(float(probs[i]), 2),
+                            "index": i,
+                            "weight": effect_weights[i],
+                        }
+                        for i in order
+                        if probs[i] > 0
+                    ],
+                }
+            )
+        result = {
+            "brews": brews,
+            "score": planned["value"],
+            "n_brews": planned["n_brews"],
+            "remaining": planned["remaining"].reshape(3, 4).tolist(),
+            "complete": planned["complete"],
+        }
+
+    return render_template(
+        "plan.html",
+        inventory=np.array(inventory).reshape(3, 4).tolist(),
+        n_brews=n_brews,
+        max_brews=MAX_PLAN_BREWS,
+        result=result,
     )
 
 
@@ -302,7 +504,7 @@ def formula():
             alpha_matrix = np.array(values, dtype=int).reshape(3, 4)
 
             # Formula-only optimizer (NO optimization)
-            opt = CauldronOptimizer(
+            opt = optimizers.get(
                 effect_weights=[1.0] * n_diplomas,
                 premium_ingr=[],
             )
@@ -332,3 +534,69 @@ def formula():
         n_diplomas=n_diplomas,
         max_diplomas=max_diplomas,
     )
+
+
+# Bulk formula evaluation: score an uploaded file of recipes, streamed back as CSV
+@app.route("/formula/bulk", methods=["POST"])
+@login_required
+def formula_bulk():
+    max_diplomas = len(EFFECT_NAMES)
+    upload = request.files.get("recipes")
+    if upload is None or not upload.filename:
+        return error(_("Debe seleccionar un archivo"), url=url_for("formula"))
+
+    try:
+        n_diplomas = int(request.form.get("n_diplomas", min(5, max_diplomas)))
+    except ValueError as e:
+        return error(str(e), url=url_for("formula"))
+    n_diplomas = max(1, min(n_diplomas, max_diplomas))
+
+    opt = optimizers.get(
+        effect_weights=[1.0] * n_diplomas,
+        premium_ingr=[],
+    )
+    rows = iter_recipe_rows(upload)
+
+    def generate():
+        header = [f"alpha_{j}" for j in range(N_INGREDIENTS)]
+        header += [f"effect_{i + 1}" for i in range(n_diplomas)]
+        yield ",".join(header) + "\n"
+        # one matrix product per chunk keeps memory flat for large uploads; a bad
+        # row ends the output after the rows read before it
+        failure = None
+        while failure is None:
+            chunk = []
+            try:
+                for values in islice(rows, BULK_CHUNK_SIZE):
+                    chunk.append(values)
+            except ValueError as e:
+                failure = f"error,{e}\n"
+            if not chunk:
+                break
+            alphas = np.array(chunk, dtype=int)
+            probs = opt.effect_probabilities_batch(alphas).round(2)
+            for alpha, p in zip(alphas.tolist(), probs.tolist()):
+                yield ",".join(map(str, alpha + p)) + "\n"
+        if failure is not None:
+            yield failure
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=formula_bulk.csv"},
+    )
+
+
+# Profiling captures (see profiling.py)
+@app.route("/admin/profiles")
+@admin_required
+def admin_profiles():
+    return render_template(
+        "admin_profiles.html", captures=recent_captures(app.config["PROFILE_DIR"])
+    )
+
+
+@app.route("/admin/profiles/<path:filename>")
+@admin_required
+def admin_profile_file(filename: str):
+    return send_from_directory(app.config["PROFILE_DIR"], filename, as_attachment=True)
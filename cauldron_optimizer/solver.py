@@ -0,0 +1,181 @@
+"""Dispatch of CPU-bound optimizer work (multistart, inventory plans).
+
+With SOLVER_WORKERS=0 (the default) solves run in the request thread. Otherwise,
+or once start() is called (the ASGI serving mode does this), they run on a
+dedicated process pool, so a long search holds neither a request thread nor the
+GIL of the serving process.
+Each pool process keeps its own OptimizerRegistry; problems are sent as their
+structure and weights, never as optimizer instances (whose caches can be large).
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from cauldron_optimizer.admission import OptimizerBusy, admission
+from cauldron_optimizer.config import get_solver_settings
+from cauldron_optimizer.constants import (
+    FRONTIER_STARTS,
+    FRONTIER_TIME_BUDGET,
+    FRONTIER_WEIGHTS,
+    OPTIMIZER_REGISTRY_SIZE,
+)
+from cauldron_optimizer.optimizer.planner import plan_brews
+from cauldron_optimizer.optimizer.registry import OptimizerRegistry
+
+# Warm optimizers of this process (only the weights change per call)
+optimizers = OptimizerRegistry(OPTIMIZER_REGISTRY_SIZE)
+
+_settings = get_solver_settings()
+_executor: ProcessPoolExecutor | None = None
+_workers = 0
+_lock = threading.Lock()
+_pending = 0  # jobs submitted to the pool and not finished, running or queued
+_pending_lock = threading.Lock()
+
+# Frontiers of this process by structure, least recently used first
+_frontiers: OrderedDict[tuple, dict] = OrderedDict()
+_frontiers_lock = threading.Lock()
+
+
+def start(workers: int | None = None) -> None:
+    """Move solves to a pool of `workers` processes (default: SOLVER_WORKERS)."""
+    global _executor, _workers
+    workers = workers or _settings["workers"]
+    with _lock:
+        if _executor is not None or workers <= 0:
+            return
+        _workers = workers
+        # spawn, not fork: the serving process runs I/O threads by now
+        executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+        )
+        # pay the import cost at startup rather than on the first search
+        for future in [executor.submit(_ping) for _ in range(workers)]:
+            future.result()
+        _executor = executor
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
+
+def multistart(problem: dict, n_starts: int, starts: str, engine: str):
+    """CauldronOptimizer.multistart for problem = optimizers.get() keyword arguments."""
+    return _run(_multistart, problem, n_starts, starts, engine)
+
+
+def plan(problem: dict, inventory, n_brews: int, **kwargs) -> dict:
+    """planner.plan_brews for problem = optimizers.get() keyword arguments."""
+    return _run(_plan, problem, inventory, n_brews, **kwargs)
+
+
+def frontier(
+    n_dipl: int, premium: tuple[int, ...], alpha_UB: int, prob_UB: int, engine: str
+) -> dict:
+    """
+    CauldronOptimizer.frontier of a structure, cached, in a compact JSON-ready form:
+    {"alphas": [[12 ints]], "probs": [[capped probability x 100, as ints]]}.
+    """
+    key = (n_dipl, premium, alpha_UB, prob_UB, engine)
+    data = cached_frontier(*key)
+    if data is None:
+        data = _run(_frontier, *key)
+        with _frontiers_lock:
+            _frontiers[key] = data
+            while len(_frontiers) > OPTIMIZER_REGISTRY_SIZE:
+                _frontiers.popitem(last=False)
+    return data
+
+
+def cached_frontier(
+    n_dipl: int, premium: tuple[int, ...], alpha_UB: int, prob_UB: int, engine: str
+) -> dict | None:
+    """The frontier of a structure if this process has computed it, else None."""
+    key = (n_dipl, premium, alpha_UB, prob_UB, engine)
+    with _frontiers_lock:
+        data = _frontiers.get(key)
+        if data is not None:
+            _frontiers.move_to_end(key)
+        return data
+
+
+def _run(fn, *args, **kwargs):
+    global _executor, _pending
+    if _executor is None and _settings["workers"] > 0:
+        start()
+    if _executor is None:
+        return fn(*args, **kwargs)
+    with _pending_lock:
+        # at most _workers jobs queued behind the running ones
+        if _pending >= 2 * _workers:
+            raise OptimizerBusy()
+        _pending += 1
+    try:
+        future = _executor.submit(fn, *args, **kwargs)
+    except BrokenProcessPool:
+        _job_done(None)
+        _replace_pool()
+    future.add_done_callback(_job_done)
+    try:
+        return future.result(timeout=_settings["timeout"])
+    except FutureTimeout:
+        # a running pool process cannot be interrupted: its admission cost stays
+        # reserved until it finishes (a job still queued is dropped)
+        future.cancel()
+        admission.release_when_done(future)
+        raise OptimizerBusy()
+    except BrokenProcessPool:
+        _replace_pool()
+
+
+def _replace_pool() -> None:
+    """A worker died (e.g. OOM-killed): replace the pool, report busy this time."""
+    global _executor
+    _executor = None
+    start(_workers)
+    raise OptimizerBusy()
+
+
+def _job_done(future) -> None:
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+def _init_worker() -> None:
+    if _settings["nice"]:
+        os.nice(_settings["nice"])
+
+
+def _ping() -> None:
+    pass
+
+
+def _multistart(problem: dict, n_starts: int, starts: str, engine: str):
+    return optimizers.get(**problem).multistart(n_starts, starts=starts, engine=engine)
+
+
+def _plan(problem: dict, inventory, n_brews: int, **kwargs) -> dict:
+    return plan_brews(optimizers.get(**problem), inventory, n_brews, **kwargs)
+
+
+def _frontier(n_dipl: int, premium: tuple[int, ...], alpha_UB: int, prob_UB: int, engine: str):
+    opt = optimizers.get(np.ones(n_dipl), list(premium), alpha_UB, prob_UB)
+    alphas, probs = opt.frontier(
+        n_weights=FRONTIER_WEIGHTS,
+        n_starts=FRONTIER_STARTS,
+        time_budget=FRONTIER_TIME_BUDGET,
+        engine=engine,
+    )
+    return {"alphas": alphas.tolist(), "probs": np.rint(100 * probs).astype(int).tolist()}
@@ -0,0 +1,95 @@
+"""Sprite sheets for the ingredient and effect icons.
+
+`flask build-sprites` packs the icons under static/ into two atlases (run it after
+adding or changing an icon; the output is committed):
+
+  static/sprites/icons.png     premium-ingredient and effect icons, 42 x 42 cells
+  static/sprites/crystals.png  ingredient crystals of the recipe cards
+
+and writes their coordinate map as static/styles/sprites.css: one class per icon
+(`sprite-ingredient-<k>`, `sprite-effect-<k>`, `sprite-crystal-<k>`, numbered like
+the source files). Positions and sizes are percentages, so an icon scales with its
+element, whose aspect ratio must match the cell's. Pillow is only needed to build.
+"""
+
+import hashlib
+import io
+import os
+
+from cauldron_optimizer.constants import EFFECT_NAMES, N_INGREDIENTS
+
+# sheet -> (cell size or None for the largest icon, columns, [(class prefix, path pattern, count)])
+SHEETS = {
+    "icons": (
+        (42, 42),
+        8,
+        [
+            ("ingredient", "ingredients/ingredient{}.png", N_INGREDIENTS),
+            ("effect", "effects/effect{}.png", len(EFFECT_NAMES)),
+        ],
+    ),
+    "crystals": (None, 4, [("crystal", "ingredients/ingredient_crystal{}.png", N_INGREDIENTS)]),
+}
+
+
+def _pct(index: int, n: int) -> str:
+    return f"{100 * index / (n - 1):.4g}%" if n > 1 else "0%"
+
+
+def build_sprites(static_folder: str) -> list[tuple[str, int, int]]:
+    """Write the atlases and sprites.css. Returns [(atlas path, icons, bytes)]."""
+    from PIL import Image
+
+    os.makedirs(os.path.join(static_folder, "sprites"), exist_ok=True)
+    css = ["/* Generated by `flask build-sprites` (cauldron_optimizer/sprites.py). Do not edit. */"]
+    report = []
+    for sheet, (cell, cols, groups) in SHEETS.items():
+        icons = [
+            (
+                f"sprite-{prefix}-{k}",
+                Image.open(os.path.join(static_folder, pattern.format(k))).convert("RGBA"),
+            )
+            for prefix, pattern, count in groups
+            for k in range(1, count + 1)
+        ]
+        if cell is None:  # no resampling: pad every icon to the largest one
+            cell = tuple(max(im.size[i] for _, im in icons) for i in (0, 1))
+        cols = min(cols, len(icons))
+        rows = -(-len(icons) // cols)
+        atlas = Image.new("RGBA", (cols * cell[0], rows * cell[1]))
+        rules = []
+        for i, (name, im) in enumerate(icons):
+            if im.size[0] > cell[0] or im.size[1] > cell[1] or max(im.size) < min(cell):
+                im = im.copy()
+                scale = min(cell[0] / im.size[0], cell[1] / im.size[1])
+                im = im.resize(
+                    (round(im.size[0] * scale), round(im.size[1] * scale)), Image.LANCZOS
+                )
+            col, row = i % cols, i // cols
+            x = col * cell[0] + (cell[0] - im.size[0]) // 2
+            y = row * cell[1] + (cell[1] - im.size[1]) // 2
+            atlas.paste(im, (x, y))
+            rules.append(f".{name} {{ background-position: {_pct(col, cols)} {_pct(row, rows)}; }}")
+
+        buf = io.BytesIO()
+        atlas.save(buf, "PNG", optimize=True)
+        data = buf.getvalue()
+        path = os.path.join(static_folder, "sprites", f"{sheet}.png")
+        with open(path, "wb") as f:
+            f.write(data)
+        version = hashlib.sha1(data).hexdigest()[:8]
+        css += [
+            "",
+            ",\n".join(f".{name}" for name, _ in icons) + " {",
+            "  display: inline-block;",
+            f'  background: url("/static/sprites/{sheet}.png?v={version}") no-repeat;',
+            f"  background-size: {100 * cols}% {100 * rows}%;",
+            f"  aspect-ratio: {cell[0]} / {cell[1]};",
+            "}",
+            *rules,
+        ]
+        report.append((os.path.relpath(path, static_folder), len(icons), len(data)))
+
+    with open(os.path.join(static_folder, "styles", "sprites.css"), "w") as f:
+        f.write("\n".join(css) + "\n")
+    return report
@@ -1,24 +1,24 @@
 // ----- Data injected from Flask (set via inline script in template) -----
-// window.OPTIMIZER_CONFIG = { defaultWeights, effectNames, dom, boundsFields }
+// window.OPTIMIZER_CONFIG = { defaultWeights, effectNames, frontierUrl, dom, boundsFields }
 
 function updateHiddenWeights(values) {
   const { weightsHidden } = window.OPTIMIZER_CONFIG.dom;
   if (weightsHidden) weightsHidden.value = JSON.stringify(values);
 }
 
-function makeRangeCard({ labelText, name, iconSrc, min, max, step, value, format = (x) => x }) {
+function makeRangeCard({ labelText, name, iconClass, min, max, step, value, format = (x) => x }) {
   const card = document.createElement("div");
   card.className = "weight-card";
 
   const topRow = document.createElement("div");
   topRow.className = "weight-top-row";
 
-  if (iconSrc) {
-    const img = document.createElement("img");
-    img.src = iconSrc;
-    img.className = "effect-icon";
-    img.alt = labelText;
-    topRow.appendChild(img);
+  if (iconClass) {
+    const icon = document.createElement("span");
+    icon.className = `effect-icon ${iconClass}`;
+    icon.setAttribute("role", "img");
+    icon.setAttribute("aria-label", labelText);
+    topRow.appendChild(icon);
   }
 
   const valueText = document.createElement("span");
@@ -82,7 +82,7 @@ function rebuildWeights() {
 
     const card = makeRangeCard({
       labelText: effectNames[i] ?? `Effect ${i + 1}`,
-      iconSrc: `/static/effects/effect${i + 1}.png`,
+      iconClass: `sprite-effect-${i + 1}`,
       name: "",
       min: 0,
       max: 1,
@@ -95,6 +95,7 @@ function rebuildWeights() {
     slider.addEventListener("input", () => {
       globalWeights[i] = Number(slider.value);
       updateHiddenWeights(globalWeights.slice(0, n));
+      renderPreview();
     });
 
     dom.weightsContainer.appendChild(card);
@@ -102,6 +103,112 @@ function rebuildWeights() {
 
   initRangeFills(dom.weightsContainer);
   updateHiddenWeights(globalWeights.slice(0, n));
+  refreshFrontier();
+}
+
+// ----- Weight-response frontier -----
+// The server sends the candidate optimal recipes of a structure (n diplomas, premium
+// set, bounds) once; picking the best one for any weights is a dot product per recipe.
+const frontierCache = new Map();
+let frontier = null;
+let frontierTimer = null;
+
+// Structure inputs can change in quick succession (premium boxes, slider steps):
+// fetch once they have settled rather than one frontier per intermediate state.
+function scheduleFrontier() {
+  clearTimeout(frontierTimer);
+  frontierTimer = setTimeout(refreshFrontier, 400);
+}
+
+function structureParams() {
+  const { dom } = window.OPTIMIZER_CONFIG;
+  const params = new URLSearchParams({ n_diploma: dom.nDiploma.value });
+  ["alpha_UB", "prob_UB"].forEach((name) => {
+    const input = dom.form.querySelector(`input[name="${name}"]`);
+    if (input) params.set(name, input.value);
+  });
+  dom.form
+    .querySelectorAll("input[name='premium_ingredients[]']:checked")
+    .forEach((cb) => params.append("premium", cb.value));
+  return params.toString();
+}
+
+async function refreshFrontier() {
+  const { frontierUrl } = window.OPTIMIZER_CONFIG;
+  const key = structureParams();
+  if (!frontierCache.has(key)) {
+    frontierCache.set(
+      key,
+      fetch(`${frontierUrl}?${key}`, { credentials: "same-origin" })
+        .then((r) => (r.ok ? r.json() : null))
+        .catch(() => null)
+    );
+  }
+  const data = await frontierCache.get(key);
+  if (!data) frontierCache.delete(key); // e.g. server busy: retry on the next change
+  if (key !== structureParams()) return; // the structure changed while loading
+  frontier = data;
+  renderPreview();
+}
+
+function renderPreview() {
+  const { effectNames, dom } = window.OPTIMIZER_CONFIG;
+  const n = Number(dom.nDiploma.value);
+  if (!frontier || frontier.probs.length === 0 || frontier.probs[0].length !== n) {
+    dom.previewCard.hidden = true;
+    return;
+  }
+
+  // all-zero weights count as uniform, like on the server
+  let weights = globalWeights.slice(0, n);
+  let total = weights.reduce((a, b) => a + b, 0);
+  if (total <= 0) {
+    weights = weights.map(() => 1);
+    total = n;
+  }
+
+  let best = 0;
+  let bestScore = -Infinity;
+  frontier.probs.forEach((probs, r) => {
+    let score = 0;
+    for (let i = 0; i < n; i++) score += probs[i] * weights[i];
+    if (score > bestScore) {
+      bestScore = score;
+      best = r;
+    }
+  });
+
+  // probabilities arrive as hundredths of a percent
+  dom.previewScore.textContent = (bestScore / total / 100).toFixed(2);
+
+  dom.previewGrid.innerHTML = "";
+  frontier.alphas[best].forEach((val, j) => {
+    const card = document.createElement("div");
+    card.className = val === 0 ? "ingredient-card zero" : "ingredient-card";
+    card.innerHTML =
+      `<span class="ingredient-icon sprite-crystal-${j + 1}" aria-hidden="true"></span>` +
+      `<div class="value-overlay"><span class="value-text">${val}</span></div>`;
+    dom.previewGrid.appendChild(card);
+  });
+
+  const probs = frontier.probs[best];
+  const order = [...probs.keys()].filter((i) => probs[i] > 0).sort((a, b) => probs[b] - probs[a]);
+  dom.previewEffects.innerHTML = "";
+  order.forEach((i) => {
+    const row = document.createElement("div");
+    row.className = "recipe-row";
+    row.style.setProperty("--hl", String(weights[i]));
+    row.innerHTML =
+      `<span class="recipe-row-value">${(probs[i] / 100).toFixed(2)}%</span>` +
+      `<span class="recipe-row-icon sprite-effect-${i + 1}" aria-hidden="true"></span>` +
+      `<span class="recipe-row-name"></span>`;
+    const name = row.querySelector(".recipe-row-name");
+    name.textContent = effectNames[i] ?? `Effect ${i + 1}`;
+    name.title = name.textContent;
+    dom.previewEffects.appendChild(row);
+  });
+
+  dom.previewCard.hidden = false;
 }
 
 function setRangeFill(el) {
@@ -136,7 +243,10 @@ function initOptimizer() {
     
     // Update bounds fields
     const slider = card.querySelector('input[type="range"]');
-    
+    if (cfg.name === "alpha_UB" || cfg.name === "prob_UB") {
+      slider.addEventListener("change", scheduleFrontier);
+    }
+
     dom.boundsContainer.append(card);
   });
 
@@ -144,6 +254,9 @@ function initOptimizer() {
   
   // Rebuild weights when diploma count changes (no auto-submit)
   dom.nDiploma.addEventListener("change", rebuildWeights);
+  dom.form
+    .querySelectorAll("input[name='premium_ingredients[]']")
+    .forEach((cb) => cb.addEventListener("change", scheduleFrontier));
   
   initRangeFills();
 }
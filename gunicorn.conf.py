@@ -0,0 +1,28 @@
+"""gunicorn settings: preloaded app, forked workers (see cauldron_optimizer/prefork.py)."""
+
+import gc
+import os
+
+wsgi_app = "api.index:app"
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+# threads > 1 (gthread workers): requests of a worker overlap, which is what its
+# AdmissionController and solver pool arbitrate; sync workers serve one at a time
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = True
+
+
+def when_ready(server):
+    from cauldron_optimizer import prefork
+
+    prefork.warm()
+    # keep the preloaded objects out of the workers' GC passes, which would
+    # otherwise touch (and so copy) their pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from cauldron_optimizer import prefork
+
+    prefork.after_fork()